@@ -20,11 +20,11 @@ Compile to executable:
 
 import os
 import sys
-import json
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -45,6 +45,7 @@ try:
         MetricCollector,
         get_all_collectors,
         ClickHouseStatusCollector,
+        json_dumps,
     )
     IMPORTS_AVAILABLE = True
 except ImportError as e:
@@ -54,6 +55,10 @@ except ImportError as e:
     sys.exit(1)
 
 
+# Upper bound on concurrent node probes
+MAX_WORKERS = 32
+
+
 # =============================================================================
 # Logging Setup
 # =============================================================================
@@ -76,7 +81,9 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
 def collect_metrics_for_node(node, cluster_name: str,
                               port: int,
                               logger: logging.Logger,
-                              debug: bool = False) -> List[MetricValue]:
+                              debug: bool = False,
+                              timestamp: Optional[str] = None,
+                              mode: str = "http") -> List[MetricValue]:
     """
     Collect all metrics for a single node.
     
@@ -86,25 +93,107 @@ def collect_metrics_for_node(node, cluster_name: str,
         port: ClickHouse HTTP port
         logger: Logger instance
         debug: Enable debug mode to print curl commands and responses
+        timestamp: ISO timestamp to stamp the metrics with (default: now)
+        mode: Health probe mode, 'http' (/ping) or 'tcp' (connect only)
     
     Returns:
         List of collected MetricValue objects
     """
-    metrics = []
     # Create collectors for this specific node's host with debug mode
-    collectors = get_all_collectors(host=node.name, port=port, debug=debug)
-    
-    for collector in collectors:
+    collectors = get_all_collectors(host=node.name, port=port, debug=debug, mode=mode)
+
+    def collect(collector: MetricCollector) -> Optional[MetricValue]:
         try:
             metric = collector.collect(
                 node_name=node.name,
-                cluster_name=cluster_name
+                cluster_name=cluster_name,
+                timestamp=timestamp
             )
-            metrics.append(metric)
-            logger.debug(f"  Collected {collector.name}: {metric.value}{metric.unit}")
+            logger.debug("  Collected %s: %s%s", collector.name, metric.value, metric.unit)
+            return metric
         except Exception as e:
-            logger.error(f"  Error collecting {collector.name} for {node.name}: {e}")
-    return metrics
+            logger.error("  Error collecting %s for %s: %s", collector.name, node.name, e)
+            return None
+
+    # Collectors block on I/O; run several at once (serially in debug mode
+    # so the printed requests and responses stay readable)
+    if debug or len(collectors) <= 1:
+        results = [collect(c) for c in collectors]
+    else:
+        with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+            results = list(executor.map(collect, collectors))
+    return [metric for metric in results if metric is not None]
+
+
+def iter_cluster_metrics(nodes, cluster_name: str,
+                         port: int,
+                         logger: logging.Logger,
+                         debug: bool = False,
+                         max_workers: int = MAX_WORKERS,
+                         mode: str = "http") -> Iterator[Tuple[int, List[MetricValue]]]:
+    """
+    Collect metrics for all nodes of a cluster concurrently, yielding each
+    node's metrics as soon as that node finishes.
+
+    Node probes are network-bound, so they are fanned out over a thread pool
+    and the wall time is roughly that of the slowest node instead of the sum
+    of all of them.
+
+    Args:
+        nodes: Node objects to collect metrics for
+        cluster_name: Name of the cluster
+        port: ClickHouse HTTP port
+        logger: Logger instance
+        debug: Enable debug mode (nodes are probed one at a time so the
+               printed curl commands and responses stay readable)
+        max_workers: Upper bound on concurrent node probes
+        mode: Health probe mode, 'http' (/ping) or 'tcp' (connect only)
+
+    Yields:
+        (index of the node in nodes, its MetricValue objects) in completion order
+    """
+    if not nodes:
+        return
+
+    workers = 1 if debug else max(1, min(max_workers, len(nodes)))
+    # One timestamp for the whole collection cycle
+    timestamp = datetime.utcnow().isoformat()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for index, node in enumerate(nodes):
+            logger.info("Collecting metrics for node: %s (host: %s)", node.name, node.name)
+            future = executor.submit(
+                collect_metrics_for_node, node, cluster_name, port, logger, debug, timestamp, mode
+            )
+            futures[future] = index
+
+        for done, future in enumerate(as_completed(futures), 1):
+            logger.debug("  %d/%d nodes completed", done, len(futures))
+            yield futures[future], future.result()
+
+
+def collect_cluster_metrics(nodes, cluster_name: str,
+                            port: int,
+                            logger: logging.Logger,
+                            debug: bool = False,
+                            max_workers: int = MAX_WORKERS,
+                            mode: str = "http") -> List[MetricValue]:
+    """
+    Collect metrics for all nodes of a cluster concurrently.
+
+    Takes the same arguments as iter_cluster_metrics.
+
+    Returns:
+        List of collected MetricValue objects, in node order
+    """
+    # One result slot per node, filled as nodes finish, so output stays in
+    # node order without a second pass
+    results: List[List[MetricValue]] = [[] for _ in nodes]
+    for index, node_metrics in iter_cluster_metrics(
+            nodes, cluster_name, port, logger, debug, max_workers, mode):
+        results[index] = node_metrics
+    return [metric for node_metrics in results for metric in node_metrics]
 
 
 def create_provider(provider_type: str, cluster_name: str, config: Dict[str, Any],
@@ -116,7 +205,9 @@ def create_provider(provider_type: str, cluster_name: str, config: Dict[str, Any
             return PowerShellClusterProvider(
                 cluster_name=cluster_name,
                 dmclient_path=config.get('dmclient_path', '.\\dmclient.exe'),
-                machine_function=config.get('machine_function', 'CH')
+                machine_function=config.get('machine_function', 'CH'),
+                cache_ttl=config.get('cache_ttl', PowerShellClusterProvider.DEFAULT_CACHE_TTL),
+                use_powershell=config.get('use_powershell', False)
             )
         elif provider_type == 'file':
             file_path = config.get('config_path', 'config/clusters.yaml')
@@ -180,21 +271,49 @@ Provider Types:
     parser.add_argument('--machine-function',
                         default='CH',
                         help='Machine function filter (for powershell provider, default: CH)')
+    parser.add_argument('--cluster-cache-ttl',
+                        type=int,
+                        default=PowerShellClusterProvider.DEFAULT_CACHE_TTL,
+                        help='Seconds to reuse cached cluster info before querying dmclient.exe again '
+                             f'(for powershell provider, default: {PowerShellClusterProvider.DEFAULT_CACHE_TTL}, 0 disables)')
+    parser.add_argument('--refresh-cluster', action='store_true',
+                        help='Ignore cached cluster info and query dmclient.exe again (for powershell provider)')
+    parser.add_argument('--use-powershell', action='store_true',
+                        help='Run dmclient.exe through PowerShell instead of launching it directly '
+                             '(for powershell provider)')
     parser.add_argument('--port',
                         type=int,
                         default=8123,
                         help='ClickHouse HTTP port (default: 8123)')
+    parser.add_argument('--mode',
+                        choices=['http', 'tcp'],
+                        default='http',
+                        help='Health probe: http checks /ping, tcp only checks the port accepts connections (default: http)')
+    parser.add_argument('--workers',
+                        type=int,
+                        default=MAX_WORKERS,
+                        help=f'Maximum number of nodes probed concurrently (default: {MAX_WORKERS})')
     parser.add_argument('--output-dir', '-o',
                         default=r'D:\ServiceHealthMatrixLogs',
                         help='Output directory for JSON log files (default: D:\\ServiceHealthMatrixLogs)')
+    parser.add_argument('--format',
+                        choices=['json', 'ndjson', 'cbor'],
+                        default='json',
+                        help='Log file format (default: json; cbor requires the cbor2 package)')
     parser.add_argument('--stdout', action='store_true',
                         help='Output metrics to stdout as JSON instead of log files')
+    parser.add_argument('--pretty', action='store_true',
+                        help='Indent JSON output for reading (default: compact)')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='With --stdout, stream one JSON object per line as each node completes')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Enable verbose output')
     parser.add_argument('--debug', '-d', action='store_true',
                         help='Enable debug mode (print curl commands and responses)')
 
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
 
     # Setup logging
     logger = setup_logging(args.verbose)
@@ -206,6 +325,8 @@ Provider Types:
         'config_path': args.config,
         'dmclient_path': args.dmclient_path,
         'machine_function': args.machine_function,
+        'cache_ttl': 0 if args.refresh_cluster else args.cluster_cache_ttl,
+        'use_powershell': args.use_powershell,
     }
 
     # Create cluster provider
@@ -215,47 +336,56 @@ Provider Types:
         sys.exit(1)
 
     # Get clusters
-    clusters = provider.get_clusters()
-    if not clusters:
-        logger.error(f"No clusters found for '{args.cluster}' using {args.provider} provider")
-        sys.exit(1)
-
-    # Find the target cluster
-    target_cluster = None
-    for cluster in clusters:
-        if cluster.name == args.cluster:
-            target_cluster = cluster
-            break
-    
-    if not target_cluster:
-        # If using powershell provider, cluster is auto-created
-        if clusters:
-            target_cluster = clusters[0]
-        else:
-            logger.error(f"Cluster '{args.cluster}' not found")
+    # Look the target cluster up by name; the powershell provider names its
+    # single cluster after the region query, so fall back to the first one
+    target_cluster = provider.get_cluster(args.cluster)
+    if target_cluster is None:
+        clusters = provider.get_clusters()
+        if not clusters:
+            logger.error(f"No clusters found for '{args.cluster}' using {args.provider} provider")
             sys.exit(1)
+        target_cluster = clusters[0]
 
     logger.info(f"Found cluster: {target_cluster.name} with {len(target_cluster.nodes)} nodes")
-    logger.info(f"Collecting clickhouse_status metric on port {args.port}")
+    logger.info(f"Collecting clickhouse_status metric on port {args.port} ({args.mode} probe)")
     if args.debug:
         logger.info("Debug mode enabled - curl commands and responses will be printed")
 
     # Initialize storage (using JsonMetricStorage from src.metrics.collector)
-    storage = JsonMetricStorage(base_dir=args.output_dir)
-
-    # Collect metrics for each node
-    all_metrics: List[MetricValue] = []
-    
-    for node in target_cluster.nodes:
-        logger.info(f"Collecting metrics for node: {node.name} (host: {node.name})")
-        
-        metrics = collect_metrics_for_node(node, target_cluster.name, args.port, logger, debug=args.debug)
-        all_metrics.extend(metrics)
+    try:
+        storage = JsonMetricStorage(base_dir=args.output_dir, pretty=args.pretty, fmt=args.format)
+    except ImportError as e:
+        logger.error(str(e))
+        return 1
+
+    if args.stdout and args.ndjson:
+        # Stream each node's metrics as soon as it finishes, without
+        # accumulating the whole cluster in memory
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+        count = 0
+        for _, node_metrics in iter_cluster_metrics(
+                target_cluster.nodes, target_cluster.name, args.port, logger,
+                debug=args.debug, max_workers=args.workers, mode=args.mode):
+            for metric in node_metrics:
+                out.write(json_dumps(metric) + b'\n')
+            out.flush()
+            count += len(node_metrics)
+        logger.info(f"Collection complete. Total metrics collected: {count}")
+        return 0
+
+    # Collect metrics for all nodes concurrently
+    all_metrics = collect_cluster_metrics(
+        target_cluster.nodes, target_cluster.name, args.port, logger, debug=args.debug,
+        max_workers=args.workers, mode=args.mode
+    )
 
     # Output results
     if args.stdout:
-        output = [m.to_dict() for m in all_metrics]
-        print(json.dumps(output, indent=2, ensure_ascii=False))
+        # Write UTF-8 bytes directly; flush first to keep ordering with print()
+        sys.stdout.flush()
+        sys.stdout.buffer.write(json_dumps(all_metrics, pretty=args.pretty) + b'\n')
+        sys.stdout.buffer.flush()
     else:
         # Store all metrics to a single JSON file per cluster
         json_file = storage.store_batch(all_metrics)
@@ -21,6 +21,12 @@ from src.alerts import AlertManager
 from src.scheduler import CollectionScheduler
 from src.web import create_app
 
+# Prefer the libyaml-backed loader when available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +41,7 @@ def load_settings(config_path: str = 'config/settings.yaml') -> dict:
         'app': {'name': 'HealthMonitor', 'debug': True},
         'storage': {'metrics_dir': 'data/metrics', 'retention_days': 7},
         'collection': {'interval_seconds': 60, 'timeout_seconds': 30},
+        'alerts': {'coalesce_window': 0.0},
         'web': {'host': '0.0.0.0', 'port': 5000},
         'cluster_provider': {
             'type': 'file',
@@ -48,7 +55,7 @@ def load_settings(config_path: str = 'config/settings.yaml') -> dict:
 
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
-            settings = yaml.safe_load(f)
+            settings = yaml.load(f, Loader=_YamlLoader)
             if settings:
                 # Merge with defaults
                 for key, value in default_settings.items():
@@ -98,7 +105,10 @@ def main():
 
     # Initialize metric storage
     metrics_dir = settings['storage']['metrics_dir']
-    metric_storage = MetricStorage(base_dir=metrics_dir)
+    metric_storage = MetricStorage(
+        base_dir=metrics_dir,
+        durable=settings['storage'].get('durable', False)
+    )
     logger.info(f"Metric storage initialized: {metrics_dir}")
 
     # Initialize metric registry with default collectors
@@ -107,7 +117,9 @@ def main():
     logger.info(f"Registered {len(collectors)} metric collectors")
 
     # Initialize alert manager
-    alert_manager = AlertManager()
+    alert_manager = AlertManager(
+        coalesce_window=settings['alerts'].get('coalesce_window', 0.0)
+    )
     alerts_config = 'config/alerts.yaml'
     if os.path.exists(alerts_config):
         alert_manager.load_rules_from_file(alerts_config)
@@ -2,32 +2,41 @@
 Source package initialization.
 """
 
-from .cluster import (
-    Node,
-    Cluster,
-    ClusterInfoProvider,
-    FileClusterProvider,
-    DatabaseClusterProvider,
-    PowerShellClusterProvider,
-    ClusterProviderFactory
-)
+import importlib
 
-from .metrics import (
-    MetricValue,
-    MetricCollector,
-    MetricStorage,
-    MetricRegistry,
-    create_default_registry
-)
+# Public names and the subpackage that defines them. They are imported on
+# first access so that importing one subpackage (e.g. src.cluster from the
+# collector CLI) does not also load alerts, the scheduler and their
+# dependencies.
+_EXPORTS = {
+    'Node': 'cluster',
+    'Cluster': 'cluster',
+    'ClusterInfoProvider': 'cluster',
+    'FileClusterProvider': 'cluster',
+    'DatabaseClusterProvider': 'cluster',
+    'PowerShellClusterProvider': 'cluster',
+    'ClusterProviderFactory': 'cluster',
+    'MetricValue': 'metrics',
+    'MetricCollector': 'metrics',
+    'MetricStorage': 'metrics',
+    'MetricRegistry': 'metrics',
+    'create_default_registry': 'metrics',
+    'AlertEvent': 'alerts',
+    'AlertAction': 'alerts',
+    'AlertRule': 'alerts',
+    'AlertManager': 'alerts',
+    'CollectionScheduler': 'scheduler',
+}
 
-from .alerts import (
-    AlertEvent,
-    AlertAction,
-    AlertRule,
-    AlertManager
-)
 
-from .scheduler import CollectionScheduler
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'Node',
@@ -6,22 +6,90 @@ against configurable rules and triggers corresponding actions.
 """
 
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, Deque, Hashable, List, Optional, Callable, Sequence, Tuple
+import atexit
+import functools
+import itertools
 import yaml
 import json
+import operator
 import os
 import logging
+import queue
+import sys
+import threading
+import time
+import weakref
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Prefer the libyaml-backed loader when available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+def _json_default(obj: Any) -> Any:
+    """Serialize numpy scalars and other objects exposing item()."""
+    item = getattr(obj, 'item', None)
+    if item is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return item()
+
+
+# Prefer orjson for serialization when available; both produce UTF-8 bytes
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_json_default)
+except ImportError:
+    orjson = None
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=_json_default, separators=(',', ':'),
+                          ensure_ascii=False).encode('utf-8')
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; batch evaluation falls back to Python
+    np = None
 
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# Tie-breaker for alert ids created within one clock tick
+_ALERT_SEQ = itertools.count()
+
+# Comparison operators supported by AlertRule.operator.
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# Vectorized equivalents of _OPS used by AlertManager.evaluate_metric_batch.
+_NP_OPS: Dict[str, Callable[[Any, Any], Any]] = {} if np is None else {
+    '>': np.greater,
+    '<': np.less,
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+
+@dataclass(slots=True)
 class AlertEvent:
     """Represents an alert event."""
     alert_id: str
@@ -36,6 +104,35 @@ class AlertEvent:
     timestamp: str
     message: str
 
+    # Memoized payloads; slots rule out functools.cached_property
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        """Payload shared by the webhook and file actions. Treat as read-only."""
+        if self._dict is None:
+            self._dict = {
+                "alert_id": self.alert_id,
+                "rule_name": self.rule_name,
+                "metric_name": self.metric_name,
+                "node_name": self.node_name,
+                "cluster_name": self.cluster_name,
+                "current_value": self.current_value,
+                "threshold": self.threshold,
+                "severity": self.severity,
+                "timestamp": self.timestamp,
+                "message": self.message
+            }
+        return self._dict
+
+    @property
+    def as_json(self) -> bytes:
+        """as_dict serialized to UTF-8 encoded JSON."""
+        if self._json is None:
+            self._json = _json_dumps(self.as_dict)
+        return self._json
+
 
 class AlertAction(ABC):
     """Abstract base class for alert actions."""
@@ -45,48 +142,102 @@ class AlertAction(ABC):
         """Execute the alert action. Returns True if successful."""
         pass
 
+    def batch_execute(self, alerts: List[AlertEvent]) -> bool:
+        """Execute the action for several coalesced alerts of one rule.
+
+        The default runs execute() for each alert; actions that can deliver
+        a group of alerts at once may override it.
+        """
+        ok = True
+        for alert in alerts:
+            ok = self.execute(alert) and ok
+        return ok
+
 
 class LogAlertAction(AlertAction):
     """Action that logs alerts to the application log."""
 
     def __init__(self, level: str = "warning"):
         self.level = level.lower()
+        self._log = getattr(logger, self.level, logger.warning)
 
     def execute(self, alert: AlertEvent) -> bool:
-        log_func = getattr(logger, self.level, logger.warning)
-        message = (
-            f"ALERT [{alert.severity.upper()}] {alert.rule_name}: "
-            f"{alert.metric_name} = {alert.current_value} {alert.operator} {alert.threshold} "
-            f"on {alert.cluster_name}/{alert.node_name}"
+        self._log(
+            "ALERT [%s] %s: %s = %s %s %s on %s/%s",
+            alert.severity.upper(), alert.rule_name, alert.metric_name,
+            alert.current_value, alert.operator, alert.threshold,
+            alert.cluster_name, alert.node_name,
         )
-        log_func(message)
         return True
 
 
-class WebhookAlertAction(AlertAction):
-    """Action that sends alerts to a webhook URL."""
+WEBHOOK_POOL_HOSTS = 32
+WEBHOOK_POOL_PER_HOST = 64
 
-    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None):
-        self.url = url
-        self.headers = headers or {"Content-Type": "application/json"}
 
-    def execute(self, alert: AlertEvent) -> bool:
+# Actions holding queued or buffered alerts, closed at interpreter exit.
+# Weak, so actions that are no longer used can still be collected.
+_OPEN_ACTIONS: "weakref.WeakSet[AlertAction]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_actions() -> None:
+    """Deliver alerts still queued or buffered when the process exits."""
+    for action in list(_OPEN_ACTIONS):
         try:
-            payload = {
-                "alert_id": alert.alert_id,
-                "rule_name": alert.rule_name,
-                "metric_name": alert.metric_name,
-                "node_name": alert.node_name,
-                "cluster_name": alert.cluster_name,
-                "current_value": alert.current_value,
-                "threshold": alert.threshold,
-                "severity": alert.severity,
-                "timestamp": alert.timestamp,
-                "message": alert.message
-            }
-            response = requests.post(
+            action.close()
+        except Exception as e:
+            logger.error("Failed to close alert action %r at exit: %s", action, e)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_webhook_session() -> requests.Session:
+    """
+    Return the HTTP session shared by all webhook actions.
+
+    Keeps connections (and TLS sessions) to each webhook endpoint alive
+    between alerts and retries transient connection failures.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=WEBHOOK_POOL_HOSTS,
+        pool_maxsize=WEBHOOK_POOL_PER_HOST,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class WebhookAlertAction(AlertAction):
+    """Action that sends alerts to a webhook URL.
+
+    By default each alert is POSTed as a JSON object as soon as it fires,
+    including alerts coalesced by AlertManager. With batch_size > 1, alerts
+    are queued and a background thread POSTs them as a JSON array of up to
+    batch_size alerts, at least every flush_interval seconds, and coalesced
+    alerts are POSTed as arrays of up to batch_size alerts; the receiving
+    endpoint must accept arrays. JSON arrays are only ever sent with
+    batch_size > 1. Queued alerts are sent when close() is called and at
+    interpreter exit.
+    """
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None,
+                 batch_size: int = 1, flush_interval: float = 1.0):
+        self.url = url
+        self.headers = dict(headers or {})
+        self.headers.setdefault("Content-Type", "application/json")
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _post(self, body: bytes) -> bool:
+        try:
+            response = _get_webhook_session().post(
                 self.url,
-                json=payload,
+                data=body,
                 headers=self.headers,
                 timeout=10
             )
@@ -95,6 +246,71 @@ class WebhookAlertAction(AlertAction):
             logger.error(f"Failed to send webhook alert: {e}")
             return False
 
+    def execute(self, alert: AlertEvent) -> bool:
+        if self.batch_size == 1:
+            return self._post(alert.as_json)
+
+        self._ensure_worker()
+        self._queue.put(alert.as_dict)
+        return True
+
+    def batch_execute(self, alerts: List[AlertEvent]) -> bool:
+        """POST coalesced alerts as JSON arrays of up to batch_size alerts.
+
+        With batch_size 1 each alert is POSTed on its own as a JSON object.
+        """
+        if self.batch_size == 1:
+            return super().batch_execute(alerts)
+        ok = True
+        for i in range(0, len(alerts), self.batch_size):
+            chunk = alerts[i:i + self.batch_size]
+            ok = self._post(_json_dumps([alert.as_dict for alert in chunk])) and ok
+        return ok
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._queue = queue.Queue()
+                self._worker = threading.Thread(
+                    target=self._run, name="webhook-alerts", daemon=True)
+                self._worker.start()
+                _OPEN_ACTIONS.add(self)
+
+    def _run(self) -> None:
+        """Drain the queue, POSTing up to batch_size alerts per request."""
+        q = self._queue
+        stopping = False
+        while not stopping:
+            item = q.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._post(_json_dumps(batch))
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Send any queued alerts and stop the background sender."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+            _OPEN_ACTIONS.discard(self)
+        if worker is not None:
+            self._queue.put(None)
+            worker.join(timeout)
+
 
 class EmailAlertAction(AlertAction):
     """Action that sends alerts via email (placeholder implementation)."""
@@ -111,33 +327,60 @@ class EmailAlertAction(AlertAction):
 
 
 class FileAlertAction(AlertAction):
-    """Action that writes alerts to a file."""
+    """Action that writes alerts to a file, one JSON object per line.
+
+    The file is kept open with a userspace buffer rather than reopened for
+    every alert. Buffered lines are flushed at most flush_interval seconds
+    after they are written, when close() is called, and at interpreter exit.
+    """
 
-    def __init__(self, file_path: str):
+    BUFFER_SIZE = 1 << 16
+
+    def __init__(self, file_path: str, flush_interval: float = 1.0):
         self.file_path = file_path
+        self.flush_interval = flush_interval
         os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        self._fh = open(file_path, 'ab', buffering=self.BUFFER_SIZE)
+        self._lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        _OPEN_ACTIONS.add(self)
 
     def execute(self, alert: AlertEvent) -> bool:
         try:
-            with open(self.file_path, 'a', encoding='utf-8') as f:
-                alert_data = {
-                    "alert_id": alert.alert_id,
-                    "rule_name": alert.rule_name,
-                    "metric_name": alert.metric_name,
-                    "node_name": alert.node_name,
-                    "cluster_name": alert.cluster_name,
-                    "current_value": alert.current_value,
-                    "threshold": alert.threshold,
-                    "severity": alert.severity,
-                    "timestamp": alert.timestamp,
-                    "message": alert.message
-                }
-                f.write(json.dumps(alert_data) + "\n")
+            line = alert.as_json + b"\n"
+            with self._lock:
+                if self._fh.closed:
+                    self._fh = open(self.file_path, 'ab', buffering=self.BUFFER_SIZE)
+                    _OPEN_ACTIONS.add(self)
+                self._fh.write(line)
+                if self.flush_interval <= 0:
+                    self._fh.flush()
+                elif self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
             return True
         except Exception as e:
             logger.error(f"Failed to write alert to file: {e}")
             return False
 
+    def flush(self) -> None:
+        """Write any buffered alerts to the file."""
+        with self._lock:
+            self._flush_timer = None
+            if not self._fh.closed:
+                self._fh.flush()
+
+    def close(self) -> None:
+        """Flush buffered alerts and close the file."""
+        with self._lock:
+            timer, self._flush_timer = self._flush_timer, None
+            if timer is not None:
+                timer.cancel()
+            if not self._fh.closed:
+                self._fh.close()
+            _OPEN_ACTIONS.discard(self)
+
 
 class CustomAlertAction(AlertAction):
     """Action that executes a custom callback function."""
@@ -155,7 +398,14 @@ class CustomAlertAction(AlertAction):
 
 @dataclass
 class AlertRule:
-    """Represents an alert rule configuration."""
+    """Represents an alert rule configuration.
+
+    Besides the cooldown, a rule can be gated on its burn rate: when
+    burn_threshold is set, a node only triggers once the rule has tripped
+    for it at least burn_threshold times per second over both the short and
+    the long window. A brief flap fails the long window and a stale
+    incident fails the short one, so neither reaches the actions.
+    """
     name: str
     metric: str
     operator: str  # >, <, >=, <=, ==, !=
@@ -164,39 +414,65 @@ class AlertRule:
     actions: List[AlertAction] = field(default_factory=list)
     enabled: bool = True
     cooldown_seconds: int = 300  # Minimum time between alerts
-
-    _last_triggered: Dict[str, datetime] = field(default_factory=dict, repr=False)
+    short_window_s: float = 0.0
+    long_window_s: float = 0.0
+    burn_threshold: float = 0.0  # Trips per second; 0 disables the gate
+
+    # node key -> time.monotonic() of the last alert, immune to wall-clock jumps.
+    # AlertManager passes small integer node ids; any hashable key works.
+    _last_triggered: Dict[Hashable, float] = field(default_factory=dict, repr=False)
+    _op_func: Optional[Callable[[Any, Any], bool]] = field(
+        default=None, init=False, repr=False, compare=False)
+    # node key -> monotonic times the rule tripped within the long window
+    _trips: Dict[Hashable, Deque[float]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._op_func = _OPS.get(self.operator)
 
     def evaluate(self, metric_value: float) -> bool:
         """Evaluate if the metric value violates the rule."""
-        operators = {
-            '>': lambda x, y: x > y,
-            '<': lambda x, y: x < y,
-            '>=': lambda x, y: x >= y,
-            '<=': lambda x, y: x <= y,
-            '==': lambda x, y: x == y,
-            '!=': lambda x, y: x != y,
-        }
-        op_func = operators.get(self.operator)
-        if op_func is None:
-            return False
-        return op_func(metric_value, self.threshold)
+        op_func = self._op_func
+        return op_func is not None and op_func(metric_value, self.threshold)
 
-    def should_trigger(self, node_key: str) -> bool:
+    def should_trigger(self, node_key: Hashable) -> bool:
         """Check if the rule should trigger (considering cooldown)."""
         if not self.enabled:
             return False
 
+        now = time.monotonic()
+        if self.burn_threshold > 0 and not self._burning(node_key, now):
+            return False
+
         last = self._last_triggered.get(node_key)
-        if last is None:
+        return last is None or (now - last) >= self.cooldown_seconds
+
+    def _burning(self, node_key: Hashable, now: float) -> bool:
+        """Record a trip and check both windows' trip rates against burn_threshold."""
+        long_window = max(self.long_window_s, self.short_window_s)
+        short_window = self.short_window_s or long_window
+        if long_window <= 0:
             return True
 
-        elapsed = (datetime.utcnow() - last).total_seconds()
-        return elapsed >= self.cooldown_seconds
+        trips = self._trips.get(node_key)
+        if trips is None:
+            trips = self._trips.setdefault(node_key, deque())
+        trips.append(now)
+        while trips and now - trips[0] >= long_window:
+            trips.popleft()
+
+        short_count = 0
+        for t in reversed(trips):
+            if now - t >= short_window:
+                break
+            short_count += 1
+
+        return (short_count / short_window >= self.burn_threshold
+                and len(trips) / long_window >= self.burn_threshold)
 
-    def mark_triggered(self, node_key: str) -> None:
+    def mark_triggered(self, node_key: Hashable) -> None:
         """Mark the rule as triggered for a node."""
-        self._last_triggered[node_key] = datetime.utcnow()
+        self._last_triggered[node_key] = time.monotonic()
 
 
 class AlertActionFactory:
@@ -210,7 +486,9 @@ class AlertActionFactory:
         elif action_type == "webhook":
             return WebhookAlertAction(
                 url=params.get("url", ""),
-                headers=params.get("headers")
+                headers=params.get("headers"),
+                batch_size=params.get("batch_size", 1),
+                flush_interval=params.get("flush_interval", 1.0)
             )
         elif action_type == "email":
             return EmailAlertAction(
@@ -219,26 +497,75 @@ class AlertActionFactory:
                 smtp_port=params.get("smtp_port", 587)
             )
         elif action_type == "file":
-            return FileAlertAction(file_path=params.get("file_path", "alerts.log"))
+            return FileAlertAction(
+                file_path=params.get("file_path", "alerts.log"),
+                flush_interval=params.get("flush_interval", 1.0)
+            )
         else:
             raise ValueError(f"Unknown action type: {action_type}")
 
 
 class AlertManager:
-    """Manages alert rules and evaluates metrics against them."""
-
-    def __init__(self):
+    """Manages alert rules and evaluates metrics against them.
+
+    Args:
+        history_size: Maximum number of alerts kept in the in-memory
+            history. Older alerts are dropped as new ones arrive.
+        coalesce_window: Seconds to hold a rule's alerts before running its
+            actions once for all of them (see AlertAction.batch_execute).
+            0 disables coalescing and runs actions as each alert fires.
+    """
+
+    HISTORY_MAX = 10000
+    ACTION_WORKERS = 16
+
+    def __init__(self, history_size: int = HISTORY_MAX, coalesce_window: float = 0.0):
+        # Rule tables are copy-on-write: writers build new dicts under
+        # _write_lock and swap them in, so evaluation reads them lock-free.
+        self._write_lock = threading.Lock()
         self._rules: Dict[str, AlertRule] = {}
-        self._alert_history: List[AlertEvent] = []
+        self._rules_by_metric: Dict[str, Tuple[AlertRule, ...]] = {}
+        self._alert_history: Deque[AlertEvent] = deque(maxlen=history_size)
+        self._action_executor = ThreadPoolExecutor(
+            max_workers=self.ACTION_WORKERS, thread_name_prefix='alert-action')
+        self.coalesce_window = coalesce_window
+        self._node_ids: Dict[str, int] = {}
+        self._node_seq = itertools.count()
+        # rule name -> (rule, alerts waiting for the rule's flush timer)
+        self._pending: Dict[str, Tuple[AlertRule, List[AlertEvent]]] = {}
+        self._pending_lock = threading.Lock()
+
+    def _node_id(self, node_key: str) -> int:
+        """Small integer id for a "cluster/node" key, used for cooldown tracking."""
+        node_id = self._node_ids.get(node_key)
+        if node_id is None:
+            node_id = self._node_ids.setdefault(sys.intern(node_key), next(self._node_seq))
+        return node_id
+
+    def _publish(self, rules: Dict[str, AlertRule]) -> None:
+        """Install a new rule table and its metric index. Call with _write_lock held."""
+        by_metric: Dict[str, List[AlertRule]] = defaultdict(list)
+        for rule in rules.values():
+            by_metric[rule.metric].append(rule)
+        self._rules_by_metric = {metric: tuple(bucket) for metric, bucket in by_metric.items()}
+        self._rules = rules
 
     def add_rule(self, rule: AlertRule) -> None:
-        """Add an alert rule."""
-        self._rules[rule.name] = rule
+        """Add an alert rule, replacing any existing rule with the same name."""
+        with self._write_lock:
+            rules = dict(self._rules)
+            rules.pop(rule.name, None)
+            rules[rule.name] = rule
+            self._publish(rules)
 
     def remove_rule(self, rule_name: str) -> None:
         """Remove an alert rule."""
-        if rule_name in self._rules:
-            del self._rules[rule_name]
+        with self._write_lock:
+            if rule_name not in self._rules:
+                return
+            rules = dict(self._rules)
+            del rules[rule_name]
+            self._publish(rules)
 
     def get_rule(self, rule_name: str) -> Optional[AlertRule]:
         """Get a rule by name."""
@@ -250,51 +577,162 @@ class AlertManager:
 
     def evaluate_metric(self, metric_name: str, metric_value: float,
                         node_name: str, cluster_name: str) -> List[AlertEvent]:
-        """Evaluate a metric against all applicable rules."""
+        """Evaluate a metric against the rules registered for it."""
         alerts = []
         node_key = f"{cluster_name}/{node_name}"
+        node_id = self._node_id(node_key)
 
-        for rule in self._rules.values():
-            if rule.metric != metric_name:
-                continue
-
+        for rule in self._rules_by_metric.get(metric_name, ()):
             if not rule.evaluate(metric_value):
                 continue
 
-            if not rule.should_trigger(node_key):
+            if not rule.should_trigger(node_id):
                 continue
 
-            # Create alert event
-            alert = AlertEvent(
-                alert_id=f"{rule.name}-{node_key}-{datetime.utcnow().timestamp()}",
-                rule_name=rule.name,
-                metric_name=metric_name,
-                node_name=node_name,
-                cluster_name=cluster_name,
-                current_value=metric_value,
-                threshold=rule.threshold,
-                operator=rule.operator,
-                severity=rule.severity,
-                timestamp=datetime.utcnow().isoformat(),
-                message=f"Alert: {metric_name} = {metric_value} {rule.operator} {rule.threshold}"
-            )
+            alerts.append(self._fire(rule, metric_name, metric_value,
+                                     node_name, cluster_name, node_key, node_id))
+
+        return alerts
 
-            # Execute actions
-            for action in rule.actions:
+    def evaluate_metric_batch(self, metric_name: str, values: Sequence[float],
+                              node_names: Sequence[str],
+                              cluster_name: str) -> List[AlertEvent]:
+        """Evaluate one metric sampled across many nodes of a cluster.
+
+        Equivalent to calling evaluate_metric for each (value, node) pair, but
+        the threshold comparison for each rule is done over the whole batch in
+        one vectorized operation when numpy is installed.
+
+        Args:
+            metric_name: Name of the metric being evaluated.
+            values: Metric values, one per node.
+            node_names: Node names, aligned with values.
+            cluster_name: Cluster the nodes belong to.
+
+        Returns:
+            Triggered alerts, grouped by rule in registration order.
+        """
+        if len(values) != len(node_names):
+            raise ValueError("values and node_names must have the same length")
+
+        rules = self._rules_by_metric.get(metric_name)
+        if not rules or not len(values):
+            return []
+
+        array = None
+        if np is not None:
+            try:
+                array = np.asarray(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                array = None
+
+        alerts = []
+        for rule in rules:
+            np_op = _NP_OPS.get(rule.operator)
+            if array is not None and np_op is not None:
+                hits = np.flatnonzero(np_op(array, rule.threshold)).tolist()
+            else:
+                hits = [i for i, value in enumerate(values) if rule.evaluate(value)]
+
+            for i in hits:
+                node_name = node_names[i]
+                node_key = f"{cluster_name}/{node_name}"
+                node_id = self._node_id(node_key)
+                if not rule.should_trigger(node_id):
+                    continue
+                alerts.append(self._fire(rule, metric_name, values[i],
+                                         node_name, cluster_name, node_key, node_id))
+
+        return alerts
+
+    def _fire(self, rule: AlertRule, metric_name: str, metric_value: Any,
+              node_name: str, cluster_name: str, node_key: str,
+              node_id: int) -> AlertEvent:
+        """Create an alert for a violated rule and run (or queue) its actions."""
+        # Monotonic ns plus a process-wide sequence keeps ids unique even if
+        # the wall clock steps backwards or the clock resolution is coarse.
+        alert = AlertEvent(
+            alert_id=f"{rule.name}-{node_key}-{time.monotonic_ns()}-{next(_ALERT_SEQ)}",
+            rule_name=rule.name,
+            metric_name=metric_name,
+            node_name=node_name,
+            cluster_name=cluster_name,
+            current_value=metric_value,
+            threshold=rule.threshold,
+            operator=rule.operator,
+            severity=rule.severity,
+            timestamp=datetime.utcnow().isoformat(),
+            message=f"Alert: {metric_name} = {metric_value} {rule.operator} {rule.threshold}"
+        )
+
+        if self.coalesce_window > 0:
+            self._queue_alert(rule, alert)
+        else:
+            self._run_actions(rule.actions, [alert])
+
+        rule.mark_triggered(node_id)
+        self._alert_history.append(alert)
+        return alert
+
+    @staticmethod
+    def _dispatch(action: AlertAction, alerts: List[AlertEvent]) -> bool:
+        if len(alerts) == 1:
+            return action.execute(alerts[0])
+        return action.batch_execute(alerts)
+
+    def _run_actions(self, actions: List[AlertAction], alerts: List[AlertEvent]) -> None:
+        """Run a rule's actions for its alerts and wait for them to finish.
+
+        A single action runs inline. Several actions run concurrently on the
+        action pool, so a slow webhook does not delay the others.
+        """
+        if len(actions) <= 1:
+            for action in actions:
                 try:
-                    action.execute(alert)
+                    self._dispatch(action, alerts)
                 except Exception as e:
                     logger.error(f"Failed to execute alert action: {e}")
+            return
 
-            rule.mark_triggered(node_key)
-            self._alert_history.append(alert)
-            alerts.append(alert)
-
-        return alerts
+        futures = [self._action_executor.submit(self._dispatch, action, alerts)
+                   for action in actions]
+        wait(futures)
+        for future in futures:
+            e = future.exception()
+            if e is not None:
+                logger.error(f"Failed to execute alert action: {e}")
+
+    def _queue_alert(self, rule: AlertRule, alert: AlertEvent) -> None:
+        """Hold an alert until the rule's coalescing window closes."""
+        with self._pending_lock:
+            pending = self._pending.get(rule.name)
+            if pending is not None:
+                pending[1].append(alert)
+                return
+            self._pending[rule.name] = (rule, [alert])
+        timer = threading.Timer(self.coalesce_window, self._flush_rule, args=(rule.name,))
+        timer.daemon = True
+        timer.start()
+
+    def _flush_rule(self, rule_name: str) -> None:
+        with self._pending_lock:
+            pending = self._pending.pop(rule_name, None)
+        if pending is not None:
+            rule, alerts = pending
+            self._run_actions(rule.actions, alerts)
+
+    def flush_pending(self) -> None:
+        """Run the actions for all coalesced alerts now."""
+        with self._pending_lock:
+            names = list(self._pending)
+        for rule_name in names:
+            self._flush_rule(rule_name)
 
     def get_alert_history(self, limit: int = 100) -> List[AlertEvent]:
-        """Get recent alert history."""
-        return self._alert_history[-limit:]
+        """Get recent alert history, oldest first."""
+        history = self._alert_history
+        start = len(history) - limit if limit > 0 else 0
+        return list(itertools.islice(history, max(0, start), None))
 
     def clear_alert_history(self) -> None:
         """Clear alert history."""
@@ -306,7 +744,7 @@ class AlertManager:
             return
 
         with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YamlLoader)
 
         if not data or 'rules' not in data:
             return
@@ -331,6 +769,9 @@ class AlertManager:
                 severity=rule_data.get('severity', 'warning'),
                 actions=actions,
                 enabled=rule_data.get('enabled', True),
-                cooldown_seconds=rule_data.get('cooldown_seconds', 300)
+                cooldown_seconds=rule_data.get('cooldown_seconds', 300),
+                short_window_s=rule_data.get('short_window_s', 0.0),
+                long_window_s=rule_data.get('long_window_s', 0.0),
+                burn_threshold=rule_data.get('burn_threshold', 0.0)
             )
             self.add_rule(rule)
@@ -6,15 +6,60 @@ from various sources including local files, databases, and PowerShell commands.
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
-import yaml
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional, Dict, Any, Tuple, Union
+import copy
+import csv
+import functools
+import io
+import itertools
 import json
+import logging
+import operator
 import subprocess
 import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
 
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _yaml_loader():
+    """
+    Import yaml on first use and pick a loader.
+
+    Prefers the libyaml-backed loader when available. yaml is only needed
+    for YAML cluster files, so other providers skip the import.
+    """
+    import yaml
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=1)
+def _powershell_executable() -> str:
+    """
+    Resolve the PowerShell executable once per process.
+
+    An absolute path spares the PATH search on every launch.
+    """
+    return shutil.which('powershell') or shutil.which('pwsh') or 'powershell'
+
+
+# Prefer orjson for JSON parsing when available (both accept bytes)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+@dataclass(slots=True)
 class Node:
     """Represents a node in a cluster."""
     name: str
@@ -24,6 +69,32 @@ class Node:
     attributes: Dict[str, Any] = field(default_factory=dict)
 
 
+def _decode(data: bytes) -> str:
+    """Decode process output captured as bytes (UTF-8, invalid bytes replaced)."""
+    return data.decode('utf-8', errors='replace')
+
+
+def _intern_str(value: Any) -> Any:
+    """sys.intern() strings; pass any other value through unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _make_node(name: str, type: str, host: str, collection_method: str,
+               attributes: Optional[Dict[str, Any]] = None) -> Node:
+    """
+    Build a Node whose low-cardinality strings are interned.
+
+    Only immutable values are shared: every Node and its attributes dict
+    are new objects, so callers may modify them without affecting other
+    clusters, providers or later refreshes.
+    """
+    return Node(
+        name, _intern_str(type), host, _intern_str(collection_method),
+        {key: _intern_str(value) if isinstance(value, str) else copy.deepcopy(value)
+         for key, value in (attributes or {}).items()}
+    )
+
+
 @dataclass
 class Cluster:
     """Represents a cluster with multiple nodes."""
@@ -31,16 +102,86 @@ class Cluster:
     description: str
     nodes: List[Node] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        # Lookup index, kept as plain attributes rather than dataclass fields
+        # so it stays out of asdict(), repr() and ==.
+        # Name -> position in nodes, rebuilt when the nodes list is replaced or resized
+        self._nodes_by_name: Dict[str, int] = {}
+        self._index_key: tuple = ()
+
+    def _rebuild_index(self) -> None:
+        index: Dict[str, int] = {}
+        for position, node in enumerate(self.nodes):
+            index.setdefault(node.name, position)
+        self._nodes_by_name = index
+        self._index_key = (id(self.nodes), len(self.nodes))
+
     def get_node(self, node_name: str) -> Optional[Node]:
         """Get a node by name."""
+        nodes = self.nodes
+        if self._index_key != (id(nodes), len(nodes)):
+            self._rebuild_index()
+        position = self._nodes_by_name.get(node_name)
+        # Only trust the hit if that slot still holds a node of this name;
+        # it may have been replaced in place since the index was built
+        if position is not None and position < len(nodes) and nodes[position].name == node_name:
+            return nodes[position]
+
+        # Stale or missing entry: the list may have been edited in place.
+        # Fall back to a scan and re-index if the scan finds the node.
         for node in self.nodes:
             if node.name == node_name:
+                self._rebuild_index()
                 return node
         return None
 
 
+# Runs providers' initial loads started with refresh_async()
+_REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cluster-refresh')
+_REFRESH_LOCK = threading.Lock()
+
+
 class ClusterInfoProvider(ABC):
-    """Abstract base class for cluster information providers."""
+    """Abstract base class for cluster information providers.
+
+    The built-in providers load lazily: the first get_clusters() or
+    get_cluster() call performs the initial refresh, and refresh_async()
+    lets callers start it in the background ahead of time.
+    """
+
+    _loaded = False
+    _load_future: Optional[Future] = None
+
+    def refresh_async(self) -> Future:
+        """
+        Start the initial load in the background and return its future.
+
+        A load that fails is forgotten once its callers have seen the error,
+        so the next call starts a new attempt rather than re-raising it.
+        """
+        with _REFRESH_LOCK:
+            if self._load_future is None:
+                self._load_future = _REFRESH_EXECUTOR.submit(self.refresh)
+                self._load_future.add_done_callback(self._forget_failed_load)
+            return self._load_future
+
+    def _forget_failed_load(self, future: Future) -> None:
+        if future.exception() is not None:
+            with _REFRESH_LOCK:
+                if self._load_future is future:
+                    self._load_future = None
+
+    def _ensure_loaded(self) -> None:
+        """Block until the initial load has finished, starting it if needed."""
+        if not self._loaded:
+            future = self.refresh_async()
+            try:
+                future.result()
+            except BaseException:
+                # The done callback may not have run yet; forget it here too
+                self._forget_failed_load(future)
+                raise
+            self._loaded = True
 
     @abstractmethod
     def get_clusters(self) -> List[Cluster]:
@@ -58,30 +199,65 @@ class ClusterInfoProvider(ABC):
         pass
 
 
+@functools.lru_cache(maxsize=16)
+def _parse_cluster_file(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a YAML or JSON cluster file.
+
+    Keyed on the file's mtime and size as well as its path, so providers
+    reading the same unchanged file share one parse and any change to the
+    file misses the cache. The result is shared; do not mutate it.
+    """
+    if path.endswith('.json'):
+        with open(path, 'rb') as f:
+            return _json_loads(f.read())
+
+    import yaml
+    # Binary stream: the loader detects the encoding itself, and
+    # libyaml reads the bytes without a Python text-decoding layer
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_yaml_loader())
+
+
 class FileClusterProvider(ClusterInfoProvider):
-    """Cluster information provider that reads from a YAML file."""
+    """Cluster information provider that reads from a YAML or JSON file."""
 
     def __init__(self, file_path: str):
         self.file_path = file_path
         self._clusters: List[Cluster] = []
-        self.refresh()
+        self._clusters_by_name: Dict[str, Cluster] = {}
+        # (mtime_ns, size) of the file the current clusters were built from
+        self._stat_key: Optional[tuple] = None
 
     def get_clusters(self) -> List[Cluster]:
+        self._ensure_loaded()
         return self._clusters
 
     def get_cluster(self, cluster_name: str) -> Optional[Cluster]:
-        for cluster in self._clusters:
-            if cluster.name == cluster_name:
-                return cluster
-        return None
+        self._ensure_loaded()
+        return self._clusters_by_name.get(cluster_name)
 
     def refresh(self) -> None:
-        self._clusters = []
-        if not os.path.exists(self.file_path):
+        self._refresh()
+        self._loaded = True
+
+    def _refresh(self) -> None:
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            self._stat_key = None
+            self._clusters = []
+            self._clusters_by_name = {}
             return
 
-        with open(self.file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if stat_key == self._stat_key:
+            return
+
+        data = _parse_cluster_file(self.file_path, *stat_key)
+        self._stat_key = stat_key
+        self._clusters = []
+        self._clusters_by_name = {}
 
         if not data or 'clusters' not in data:
             return
@@ -89,7 +265,7 @@ class FileClusterProvider(ClusterInfoProvider):
         for cluster_data in data['clusters']:
             nodes = []
             for node_data in cluster_data.get('nodes', []):
-                node = Node(
+                node = _make_node(
                     name=node_data['name'],
                     type=node_data.get('type', 'worker'),
                     host=node_data.get('host', 'localhost'),
@@ -104,6 +280,7 @@ class FileClusterProvider(ClusterInfoProvider):
                 nodes=nodes
             )
             self._clusters.append(cluster)
+            self._clusters_by_name.setdefault(cluster.name, cluster)
 
 
 class DatabaseClusterProvider(ClusterInfoProvider):
@@ -112,26 +289,32 @@ class DatabaseClusterProvider(ClusterInfoProvider):
     def __init__(self, connection_string: str):
         self.connection_string = connection_string
         self._clusters: List[Cluster] = []
+        self._clusters_by_name: Dict[str, Cluster] = {}
         # Database connection would be established here
-        self.refresh()
 
     def get_clusters(self) -> List[Cluster]:
+        self._ensure_loaded()
         return self._clusters
 
     def get_cluster(self, cluster_name: str) -> Optional[Cluster]:
-        for cluster in self._clusters:
-            if cluster.name == cluster_name:
-                return cluster
-        return None
+        self._ensure_loaded()
+        return self._clusters_by_name.get(cluster_name)
 
     def refresh(self) -> None:
         # Placeholder for database implementation
         # In a real implementation, this would query the database
         self._clusters = []
+        self._clusters_by_name = {}
+        self._loaded = True
 
 
 class PowerShellClusterProvider(ClusterInfoProvider):
-    """Cluster information provider that uses dmclient.exe via PowerShell."""
+    """Cluster information provider that uses dmclient.exe.
+
+    dmclient.exe is launched directly with its directory as the working
+    directory. Set use_powershell to run it through a PowerShell command
+    instead, as earlier versions did.
+    """
 
     # CSV column indices based on machineinfo.csv format
     COL_MACHINE_NAME = 0
@@ -140,9 +323,20 @@ class PowerShellClusterProvider(ClusterInfoProvider):
     COL_STATUS = 10
     COL_ENVIRONMENT = 17
 
+    # Pulls the columns above out of a row in a single C call
+    _ROW_FIELDS = operator.itemgetter(COL_MACHINE_NAME, COL_MACHINE_FUNCTION,
+                                      COL_STATIC_IP, COL_STATUS, COL_ENVIRONMENT)
+
+    # Cluster membership is stable for minutes; reuse dmclient output this long
+    DEFAULT_CACHE_TTL = 300
+    DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "healthmonitor")
+
     def __init__(self, cluster_name: str,
                  dmclient_path: str = "D:\\app\\APTools.ap_2026_01_25_25001\\",
-                 machine_function: str = "CH"):
+                 machine_function: str = "CH",
+                 cache_ttl: int = DEFAULT_CACHE_TTL,
+                 cache_dir: Optional[str] = None,
+                 use_powershell: bool = False):
         """
         Initialize PowerShellClusterProvider.
 
@@ -152,13 +346,29 @@ class PowerShellClusterProvider(ClusterInfoProvider):
             dmclient_path: Directory path containing dmclient.exe and environment files
                           (e.g., "D:\\app\\APTools.ap_2026_01_25_25001\\")
             machine_function: Machine function filter (e.g., "CH")
+            cache_ttl: Seconds a cached discovery result stays valid (0 forces a fresh query)
+            cache_dir: Directory for cached discovery results
+                       (default: ~/.cache/healthmonitor)
+            use_powershell: Run dmclient.exe through PowerShell instead of
+                            launching it directly
         """
         self.cluster_name = cluster_name
         self.region = self._extract_region(cluster_name)
         self.dmclient_path = dmclient_path
         self.machine_function = machine_function
+        self.cache_ttl = cache_ttl
+        self.cache_dir = cache_dir or self.DEFAULT_CACHE_DIR
+        self.use_powershell = use_powershell
         self._clusters: List[Cluster] = []
-        self.refresh()
+        self._clusters_by_name: Dict[str, Cluster] = {}
+        # In-memory result stays valid until this monotonic deadline, as long
+        # as dmclient.exe has not been replaced in the meantime
+        self._cache_expiry = 0.0
+        self._cache_mtime: Optional[float] = None
+        # Single-flight guard: concurrent refresh() calls share one dmclient run
+        self._refresh_lock = threading.Lock()
+        self._inflight: Optional[Future] = None
+        self._args, self._cwd = self._build_command()
 
     @staticmethod
     def _extract_region(cluster_name: str) -> str:
@@ -171,77 +381,242 @@ class PowerShellClusterProvider(ClusterInfoProvider):
         Returns:
             The region code (e.g., "MWHE01")
         """
-        if not cluster_name:
-            return ""
-        parts = cluster_name.split('-')
-        return parts[-1] if parts else ""
+        # rpartition yields the whole name when there is no '-', like split()[-1]
+        return cluster_name.rpartition('-')[2]
 
     def get_clusters(self) -> List[Cluster]:
+        self._ensure_loaded()
         return self._clusters
 
     def get_cluster(self, cluster_name: str) -> Optional[Cluster]:
-        for cluster in self._clusters:
-            if cluster.name == cluster_name:
-                return cluster
-        return None
+        self._ensure_loaded()
+        return self._clusters_by_name.get(cluster_name)
+
+    def _get_cache_path(self) -> str:
+        """Get the cache file path for this cluster and machine function."""
+        return os.path.join(self.cache_dir, f"cluster_{self.cluster_name}_{self.machine_function}.json")
+
+    def _dmclient_exe(self) -> str:
+        """Path to dmclient.exe; dmclient_path may name the directory or the exe."""
+        if self.dmclient_path.lower().endswith('.exe'):
+            return self.dmclient_path
+        return os.path.join(self.dmclient_path, 'dmclient.exe')
+
+    def _dmclient_mtime(self) -> Optional[float]:
+        """Modification time of dmclient.exe, or None if it cannot be read."""
+        try:
+            return os.path.getmtime(self._dmclient_exe())
+        except OSError:
+            return None
+
+    def _build_command(self) -> Tuple[List[str], Optional[str]]:
+        """
+        Build the dmclient.exe argv and working directory.
+
+        The inputs are fixed for the provider's lifetime, so this runs once in
+        __init__ rather than on every refresh.
+        """
+        dm_command = f'GetMachineInfo -f {self.machine_function} -w {self.cluster_name}'
+        if self.use_powershell:
+            # Build command - first cd to dmclient directory, then execute dmclient.exe
+            # This is needed because dmclient.exe requires environment files in the same directory
+            # Force UTF-8 console output so the captured bytes decode in one pass
+            # regardless of the machine's OEM/ANSI code page
+            full_command = (
+                "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; "
+                f"cd '{self.dmclient_path}'; .\\dmclient.exe -C {self.region} -c \"{dm_command}\""
+            )
+            # -NoProfile/-NonInteractive skip loading user profiles at startup
+            args = [_powershell_executable(), '-NoProfile', '-NonInteractive',
+                    '-Command', full_command]
+            cwd = None
+        else:
+            # Launch dmclient.exe directly from its own directory, where its
+            # environment files live; no shell, so no quoting of arguments
+            exe = self._dmclient_exe()
+            args = [exe, '-C', self.region, '-c', dm_command]
+            cwd = os.path.dirname(exe) or None
+        return args, cwd
+
+    def _memory_cache_valid(self) -> bool:
+        """Whether the clusters from the previous refresh can be reused."""
+        return (self.cache_ttl > 0
+                and bool(self._clusters)
+                and time.monotonic() < self._cache_expiry
+                and self._dmclient_mtime() == self._cache_mtime)
+
+    def _remember(self, age: float = 0.0) -> None:
+        """Start the in-memory TTL for a result that is already age seconds old."""
+        self._cache_expiry = time.monotonic() + self.cache_ttl - age
+        self._cache_mtime = self._dmclient_mtime()
+
+    def invalidate(self) -> None:
+        """
+        Discard cached cluster info so the next refresh queries dmclient.exe.
+
+        For callers that know the cluster topology has changed before the
+        cache TTL runs out. Clears both the in-memory result and the cache file.
+        """
+        self._cache_expiry = 0.0
+        try:
+            os.remove(self._get_cache_path())
+        except OSError:
+            pass
+
+    def _load_cached_nodes(self) -> Optional[List[Node]]:
+        """Load nodes from the cache file if it is younger than the TTL."""
+        if self.cache_ttl <= 0:
+            return None
+
+        cache_path = self._get_cache_path()
+        try:
+            age = time.time() - os.path.getmtime(cache_path)
+            if age > self.cache_ttl:
+                return None
+            with open(cache_path, 'rb') as f:
+                data = _json_loads(f.read())
+            nodes = [_make_node(**node_data) for node_data in data]
+        except (OSError, ValueError, TypeError):
+            return None
+        self._remember(max(age, 0.0))
+        return nodes
+
+    def _save_cached_nodes(self, nodes: List[Node]) -> None:
+        """
+        Write nodes to the cache file atomically.
+
+        Each write goes through its own temporary file, so concurrent runs
+        sharing the cache directory never write over each other's data.
+        """
+        cache_path = self._get_cache_path()
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir,
+                                            prefix=os.path.basename(cache_path) + '.',
+                                            suffix='.tmp')
+            with open(fd, 'w', encoding='utf-8') as f:
+                json.dump([asdict(node) for node in nodes], f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning("Failed to write cluster cache %s: %s", cache_path, e)
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
 
     def refresh(self) -> None:
+        """
+        Refresh cluster information from dmclient.exe.
+
+        Concurrent callers do not each start their own dmclient.exe: the first
+        one runs the query and the others wait for it and share its result.
+        """
+        with self._refresh_lock:
+            future = self._inflight
+            owner = future is None
+            if owner:
+                future = self._inflight = Future()
+
+        if not owner:
+            future.result()
+            return
+
+        try:
+            self._refresh()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._loaded = True
+            future.set_result(None)
+        finally:
+            with self._refresh_lock:
+                self._inflight = None
+
+    def _refresh(self) -> None:
+        if self._memory_cache_valid():
+            return
+
         self._clusters = []
+        self._clusters_by_name = {}
+
+        nodes = self._load_cached_nodes()
+        if nodes is not None:
+            logger.info("Using cached cluster info: %s", self._get_cache_path())
+            self._add_cluster(nodes)
+            return
         
-        # Build command - first cd to dmclient directory, then execute dmclient.exe
-        # This is needed because dmclient.exe requires environment files in the same directory
-        dm_command = f'GetMachineInfo -f {self.machine_function} -w {self.cluster_name}'
-        full_command = f"cd '{self.dmclient_path}'; .\\dmclient.exe -C {self.region} -c \"{dm_command}\""
-        powershell_args = ['powershell', '-Command', full_command]
-        
-        print(f"[PowerShellClusterProvider] Executing command:")
-        print(f"  powershell -Command {full_command}")
-        
+        args, cwd = self._args, self._cwd
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing command: %s", subprocess.list2cmdline(args))
+
         try:
+            # No stdin: the child would otherwise hold the parent's console
+            # input open.
             result = subprocess.run(
-                powershell_args,
+                args,
+                cwd=cwd,
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
-                text=True,
                 timeout=120
             )
 
-            print(f"[PowerShellClusterProvider] Return code: {result.returncode}")
-            
-            if result.stderr:
-                print(f"[PowerShellClusterProvider] STDERR: {result.stderr[:500]}")
+            logger.debug("Return code: %d", result.returncode)
+
+            # Output is captured as bytes; only the parser decodes stdout in
+            # full, the previews below decode just what they print
+            stdout = result.stdout or b''
+            stderr = result.stderr or b''
+
+            if stderr:
+                logger.warning("dmclient STDERR: %s", _decode(stderr[:500]))
             
-            if result.returncode == 0 and result.stdout:
-                print(f"[PowerShellClusterProvider] STDOUT ({len(result.stdout)} chars):")
-                # Print first few lines for debugging
-                lines = result.stdout.strip().split('\n')
-                for i, line in enumerate(lines[:5]):
-                    print(f"  {line[:200]}")
-                if len(lines) > 5:
-                    print(f"  ... ({len(lines) - 5} more lines)")
+            if result.returncode == 0 and stdout:
+                if logger.isEnabledFor(logging.DEBUG):
+                    # Log first few lines for debugging
+                    logger.debug("STDOUT (%d bytes):", len(stdout))
+                    # Stream the preview lines; the rest of the buffer is only
+                    # scanned to count its newlines, never split or copied
+                    preview = io.BytesIO(stdout)
+                    for line in itertools.islice(preview, 5):
+                        logger.debug("  %s", _decode(line[:200].rstrip()))
+                    remaining = stdout.count(b'\n', preview.tell())
+                    if not stdout.endswith(b'\n') and preview.tell() < len(stdout):
+                        remaining += 1
+                    if remaining:
+                        logger.debug("  ... (%d more lines)", remaining)
                 
-                self._parse_csv_output(result.stdout)
-                print(f"[PowerShellClusterProvider] Parsed {len(self._clusters)} cluster(s)")
-                if self._clusters:
-                    for cluster in self._clusters:
-                        print(f"  Cluster '{cluster.name}': {len(cluster.nodes)} node(s)")
+                self._parse_csv_output(stdout)
+                logger.info("Parsed %d cluster(s)", len(self._clusters))
+                for cluster in self._clusters:
+                    logger.debug("  Cluster '%s': %d node(s)", cluster.name, len(cluster.nodes))
             else:
-                print(f"[PowerShellClusterProvider] No output or command failed")
-                if result.stdout:
-                    print(f"[PowerShellClusterProvider] STDOUT: {result.stdout[:200]}")
+                logger.warning("dmclient returned no output or failed (return code %d)",
+                               result.returncode)
+                if stdout:
+                    logger.warning("dmclient STDOUT: %s", _decode(stdout[:200]))
 
         except subprocess.TimeoutExpired as e:
-            print(f"[PowerShellClusterProvider] ERROR: Command timed out after 120 seconds")
-            print(f"  Exception: {e}")
+            logger.error("Command timed out after 120 seconds: %s", e)
         except FileNotFoundError as e:
-            print(f"[PowerShellClusterProvider] ERROR: Command not found")
-            print(f"  Exception: {e}")
+            logger.error("Command not found: %s", e)
         except Exception as e:
-            print(f"[PowerShellClusterProvider] ERROR: {type(e).__name__}: {e}")
+            logger.error("%s: %s", type(e).__name__, e)
 
-    def _parse_csv_output(self, csv_content: str) -> None:
+    def _parse_csv_output(self, csv_content: Union[str, bytes]) -> None:
         """Parse CSV output from dmclient.exe and extract node information."""
         nodes = self.parse_machine_info_csv(csv_content)
 
+        if nodes:
+            self._save_cached_nodes(nodes)
+            self._remember()
+        self._add_cluster(nodes)
+
+    def _add_cluster(self, nodes: List[Node]) -> None:
+        """Add the provider's cluster built from the given nodes."""
         if nodes:
             cluster = Cluster(
                 name=self.cluster_name,
@@ -249,38 +624,48 @@ class PowerShellClusterProvider(ClusterInfoProvider):
                 nodes=nodes
             )
             self._clusters.append(cluster)
+            self._clusters_by_name.setdefault(cluster.name, cluster)
 
     @classmethod
-    def parse_machine_info_csv(cls, csv_content: str) -> List[Node]:
+    def parse_machine_info_csv(cls, csv_content: Union[str, bytes]) -> List[Node]:
         """
         Parse machineinfo CSV content and extract nodes.
 
         Args:
-            csv_content: The CSV content string from dmclient.exe output
+            csv_content: The CSV content from dmclient.exe output, either as
+                         text or as the raw UTF-8 bytes captured from the process
 
         Returns:
             List of Node objects parsed from the CSV
         """
+        if isinstance(csv_content, (bytes, bytearray)):
+            csv_content = _decode(csv_content)
         nodes = []
-        lines = csv_content.strip().split('\n')
-
-        for line in lines:
+        # Hoisted out of the row loop: locals are cheaper than attribute and
+        # global lookups on every row
+        row_fields = cls._ROW_FIELDS
+        min_fields = cls.COL_ENVIRONMENT + 1
+        intern = sys.intern
+        make_node = _make_node
+        nodes_append = nodes.append
+
+        # csv.reader splits rows in C and also copes with quoted fields
+        for fields in csv.reader(io.StringIO(csv_content)):
             # Skip comment lines (starting with #) and empty lines
-            line = line.strip()
-            if not line or line.startswith('#'):
+            if not fields or fields[0].lstrip().startswith('#'):
                 continue
 
-            fields = line.split(',')
-
             # Ensure we have enough fields
-            if len(fields) <= cls.COL_ENVIRONMENT:
+            if len(fields) < min_fields:
                 continue
 
-            machine_name = fields[cls.COL_MACHINE_NAME].strip()
-            machine_function = fields[cls.COL_MACHINE_FUNCTION].strip()
-            static_ip = fields[cls.COL_STATIC_IP].strip()
-            status = fields[cls.COL_STATUS].strip()
-            environment = fields[cls.COL_ENVIRONMENT].strip()
+            machine_name, machine_function, static_ip, status, environment = row_fields(fields)
+            machine_name = machine_name.strip()
+            # Low-cardinality columns: share one string object per value
+            machine_function = intern(machine_function.strip())
+            static_ip = static_ip.strip()
+            status = intern(status.strip())
+            environment = intern(environment.strip())
 
             # Skip if machine name is empty
             if not machine_name:
@@ -290,7 +675,7 @@ class PowerShellClusterProvider(ClusterInfoProvider):
             if machine_function.upper() == 'UTILITY':
                 continue
 
-            node = Node(
+            node = make_node(
                 name=machine_name,
                 type=machine_function,
                 host=static_ip if static_ip else machine_name,
@@ -300,7 +685,7 @@ class PowerShellClusterProvider(ClusterInfoProvider):
                     "environment": environment
                 }
             )
-            nodes.append(node)
+            nodes_append(node)
 
         return nodes
 
@@ -308,9 +693,39 @@ class PowerShellClusterProvider(ClusterInfoProvider):
 class ClusterProviderFactory:
     """Factory class for creating cluster information providers."""
 
+    # Providers already created, keyed on type and configuration
+    _provider_cache: Dict[Tuple, ClusterInfoProvider] = {}
+    _provider_cache_lock = threading.Lock()
+
+    @classmethod
+    def create(cls, provider_type: str, config: Dict[str, Any]) -> ClusterInfoProvider:
+        """
+        Create a cluster provider based on type and configuration.
+
+        Calls with the same type and configuration share one provider, so its
+        source is loaded once rather than once per caller. Configurations with
+        unhashable values always get a new provider.
+        """
+        try:
+            key = (provider_type, tuple(sorted(config.items())))
+            hash(key)
+        except TypeError:
+            return cls._create(provider_type, config)
+
+        with cls._provider_cache_lock:
+            provider = cls._provider_cache.get(key)
+            if provider is None:
+                provider = cls._provider_cache[key] = cls._create(provider_type, config)
+            return provider
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Forget shared providers so later create() calls build new ones."""
+        with cls._provider_cache_lock:
+            cls._provider_cache.clear()
+
     @staticmethod
-    def create(provider_type: str, config: Dict[str, Any]) -> ClusterInfoProvider:
-        """Create a cluster provider based on type and configuration."""
+    def _create(provider_type: str, config: Dict[str, Any]) -> ClusterInfoProvider:
         if provider_type == 'file':
             return FileClusterProvider(config.get('file_path', 'config/clusters.yaml'))
         elif provider_type == 'database':
@@ -319,7 +734,10 @@ class ClusterProviderFactory:
             return PowerShellClusterProvider(
                 cluster_name=config.get('cluster_name', ''),
                 dmclient_path=config.get('dmclient_path', 'D:\\app\\APTools.ap_2026_01_25_25001\\'),
-                machine_function=config.get('machine_function', 'CH')
+                machine_function=config.get('machine_function', 'CH'),
+                cache_ttl=config.get('cache_ttl', PowerShellClusterProvider.DEFAULT_CACHE_TTL),
+                cache_dir=config.get('cache_dir'),
+                use_powershell=config.get('use_powershell', False)
             )
         else:
             raise ValueError(f"Unknown provider type: {provider_type}")
@@ -6,18 +6,167 @@ from cluster nodes. Metrics are collected periodically and stored in JSON format
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
-from typing import Dict, Any, List, Optional, Callable
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Callable, Tuple
+import functools
+import itertools
 import json
+import logging
 import os
-import uuid
-import requests
+import socket
+import tempfile
 import threading
 import time
 
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Prefer orjson for JSON serialization when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Advisory file locks: fcntl on POSIX, msvcrt on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize objects that provide to_dict() (e.g. MetricValue)."""
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def json_dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes.
+
+    Uses orjson when it is installed and falls back to the json module with
+    the same output shape (non-ASCII kept as is). MetricValue objects can be
+    passed directly: orjson serializes the dataclass natively without
+    building an intermediate dict, the fallback goes through to_dict().
+
+    Args:
+        obj: Object to serialize
+        pretty: Indent with 2 spaces instead of emitting compact JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, default=_json_default, indent=2,
+                          ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, default=_json_default, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when it is installed."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class MetricSerializer(ABC):
+    """Encodes and decodes the record list of one metric log file."""
+
+    # File extension (without dot) for files in this format
+    extension: str = ""
+
+    @abstractmethod
+    def dumps(self, records: List[Dict[str, Any]]) -> bytes:
+        """Encode records to file content."""
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> List[Dict[str, Any]]:
+        """Decode file content to records."""
+        pass
+
+
+class JsonSerializer(MetricSerializer):
+    """A single JSON array (the dashboard's native format)."""
+
+    extension = "json"
+
+    def __init__(self, pretty: bool = False):
+        self.pretty = pretty
+
+    def dumps(self, records: List[Dict[str, Any]]) -> bytes:
+        return json_dumps(records, pretty=self.pretty)
+
+    def loads(self, data: bytes) -> List[Dict[str, Any]]:
+        return json_loads(data)
+
+
+class NdjsonSerializer(JsonSerializer):
+    """One compact JSON object per line."""
+
+    extension = "ndjson"
+
+    def dumps(self, records: List[Dict[str, Any]]) -> bytes:
+        return b''.join(json_dumps(record) + b'\n' for record in records)
+
+    def loads(self, data: bytes) -> List[Dict[str, Any]]:
+        loads = super().loads
+        return [loads(line) for line in data.splitlines() if line.strip()]
+
+
+class CborSerializer(MetricSerializer):
+    """Binary CBOR array; smaller and faster to parse than JSON. Requires cbor2."""
+
+    extension = "cbor"
+
+    def __init__(self):
+        try:
+            import cbor2
+        except ImportError as e:
+            raise ImportError("The 'cbor' format requires the cbor2 package (pip install cbor2)") from e
+        self._cbor2 = cbor2
+
+    def dumps(self, records: List[Dict[str, Any]]) -> bytes:
+        return self._cbor2.dumps(records)
+
+    def loads(self, data: bytes) -> List[Dict[str, Any]]:
+        return self._cbor2.loads(data)
+
+
+# Storage format name -> serializer class
+SERIALIZERS: Dict[str, type] = {
+    'json': JsonSerializer,
+    'ndjson': NdjsonSerializer,
+    'cbor': CborSerializer,
+}
+
+
+def get_serializer(fmt: str = 'json', pretty: bool = False) -> MetricSerializer:
+    """
+    Create the serializer for a storage format.
+
+    Args:
+        fmt: One of SERIALIZERS ('json', 'ndjson', 'cbor')
+        pretty: Indent output (json only)
+    """
+    if fmt not in SERIALIZERS:
+        raise ValueError(f"Unknown storage format: {fmt} (expected one of {', '.join(SERIALIZERS)})")
+    if fmt == 'json':
+        return JsonSerializer(pretty=pretty)
+    return SERIALIZERS[fmt]()
+
+
+# Metric ID prefix, unique per host and process
+_METRIC_ID_PREFIX = f"{socket.gethostname()}-{os.getpid()}-"
+
+
+@dataclass(slots=True)
 class MetricValue:
     """Represents a single metric measurement."""
     metric_id: str
@@ -30,12 +179,25 @@ class MetricValue:
     tags: Dict[str, str] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Built directly rather than via dataclasses.asdict(), which deep-copies every field
+        return {
+            'metric_id': self.metric_id,
+            'metric_name': self.metric_name,
+            'value': self.value,
+            'timestamp': self.timestamp,
+            'node_name': self.node_name,
+            'cluster_name': self.cluster_name,
+            'unit': self.unit,
+            'tags': dict(self.tags),
+        }
 
 
 class MetricCollector(ABC):
     """Abstract base class for metric collectors."""
 
+    # Process-wide sequence for metric IDs, shared by all collectors
+    _id_counter = itertools.count()
+
     def __init__(self, name: str, unit: str = "", interval: int = 60):
         self.name = name
         self.unit = unit
@@ -46,36 +208,75 @@ class MetricCollector(ABC):
         """Collect the metric value."""
         pass
 
-    def _create_metric(self, node_name: str, cluster_name: str, value: Any) -> MetricValue:
-        """Helper method to create a MetricValue instance."""
+    def _create_metric(self, node_name: str, cluster_name: str, value: Any,
+                       timestamp: Optional[str] = None) -> MetricValue:
+        """
+        Helper method to create a MetricValue instance.
+
+        Args:
+            timestamp: ISO timestamp shared by a collection cycle (default: now)
+        """
         return MetricValue(
-            metric_id=str(uuid.uuid4()),
+            metric_id=_METRIC_ID_PREFIX + str(next(self._id_counter)),
             metric_name=self.name,
             value=value,
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=timestamp or datetime.utcnow().isoformat(),
             node_name=node_name,
             cluster_name=cluster_name,
             unit=self.unit
         )
 
 
+# Connection pool bounds for the shared HTTP session: hosts kept, connections per host
+HTTP_POOL_HOSTS = 256
+HTTP_POOL_PER_HOST = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_session():
+    """
+    Return the HTTP session shared by all ClickHouse probes.
+
+    Connections to each host are kept alive and reused between requests
+    instead of opening a new TCP connection for every probe.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_PER_HOST)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 class ClickHouseStatusCollector(MetricCollector):
     """
     Collects ClickHouse server health status via HTTP ping endpoint.
     
     Uses: /ping endpoint which returns 'Ok.' if server is healthy.
     Equivalent curl: curl 'http://host:8123/ping'
+
+    In 'tcp' mode only a TCP connect to the port is attempted. This is a
+    cheaper liveness check (one round trip, no HTTP) but it does not verify
+    that the server answers queries.
     
     Returns: 1 = healthy, 0 = unhealthy/unreachable
     """
 
+    MODES = ("http", "tcp")
+
     def __init__(self, host: str = "localhost", port: int = 8123,
-                 interval: int = 60, timeout: int = 10, debug: bool = False):
+                 interval: int = 60, timeout: int = 10, debug: bool = False,
+                 mode: str = "http"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown probe mode: {mode} (expected one of {', '.join(self.MODES)})")
         super().__init__(name="clickhouse_status", unit="", interval=interval)
         self.host = host
         self.port = port
         self.timeout = timeout
         self.debug = debug
+        self.mode = mode
 
     def _get_base_url(self) -> str:
         return f"http://{self.host}:{self.port}"
@@ -87,18 +288,30 @@ class ClickHouseStatusCollector(MetricCollector):
 
     def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
         """
-        Check ClickHouse health via /ping endpoint.
+        Check ClickHouse health via /ping endpoint (or a TCP connect in 'tcp' mode).
         Returns 1 if healthy, 0 if unhealthy or unreachable.
         """
+        self._debug_print(f"Node: {node_name}")
+        if self.mode == "tcp":
+            status = self._probe_tcp()
+        else:
+            status = self._probe_http()
+        self._debug_print("-" * 50)
+        return self._create_metric(node_name, cluster_name, status, kwargs.get('timestamp'))
+
+    def _probe_http(self) -> int:
+        """Request /ping and return 1 if the server answers 'Ok.'."""
         url = f"{self._get_base_url()}/ping"
         
         # Print equivalent curl command in debug mode
         curl_cmd = f"curl -s -m {self.timeout} '{url}'"
-        self._debug_print(f"Node: {node_name}")
         self._debug_print(f"Curl command: {curl_cmd}")
         
+        # Imported here so the tcp mode and --help never load requests
+        import requests
+
         try:
-            response = requests.get(url, timeout=self.timeout)
+            response = _get_http_session().get(url, timeout=self.timeout)
             response_text = response.text.strip()
             status = 1 if response.status_code == 200 and response_text == "Ok." else 0
             
@@ -117,25 +330,50 @@ class ClickHouseStatusCollector(MetricCollector):
             self._debug_print(f"Error: {type(e).__name__} - {e}")
             status = 0
         
-        self._debug_print("-" * 50)
-        return self._create_metric(node_name, cluster_name, status)
+        return status
+
+    def _probe_tcp(self) -> int:
+        """Open a TCP connection to host:port and return 1 if it succeeds."""
+        self._debug_print(f"TCP connect: {self.host}:{self.port} (timeout {self.timeout}s)")
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                pass
+            status = 1
+        except OSError as e:
+            self._debug_print(f"Error: Connection failed - {e}")
+            status = 0
+        self._debug_print(f"Result: {status} ({'healthy' if status == 1 else 'unhealthy'})")
+        return status
+
+
+# Collector classes instantiated for every node by get_all_collectors
+_COLLECTOR_CLASSES = (ClickHouseStatusCollector,)
 
 
-def get_all_collectors(host: str = "localhost", port: int = 8123, debug: bool = False) -> List[MetricCollector]:
+@functools.lru_cache(maxsize=4096)
+def _collectors_for(host: str, port: int, debug: bool, mode: str) -> Tuple[MetricCollector, ...]:
+    """Build the collectors for one host once; they hold only configuration."""
+    return tuple(cls(host=host, port=port, debug=debug, mode=mode) for cls in _COLLECTOR_CLASSES)
+
+
+def get_all_collectors(host: str = "localhost", port: int = 8123, debug: bool = False,
+                       mode: str = "http") -> List[MetricCollector]:
     """
     Get all available metric collectors.
+
+    Collector instances are shared between calls with the same arguments,
+    so repeated collection cycles do not rebuild them.
     
     Args:
         host: ClickHouse host address
         port: ClickHouse HTTP port
         debug: Enable debug mode to print curl commands and results
+        mode: Health probe mode, 'http' (/ping) or 'tcp' (connect only)
     
     Returns:
         List of metric collectors (currently only ClickHouseStatusCollector)
     """
-    return [
-        ClickHouseStatusCollector(host=host, port=port, debug=debug),
-    ]
+    return list(_collectors_for(host, port, debug, mode))
 
 
 # =============================================================================
@@ -146,12 +384,151 @@ def get_all_collectors(host: str = "localhost", port: int = 8123, debug: bool =
 
 import warnings
 
-# Try to import psutil, handle if not available
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
+@functools.lru_cache(maxsize=1)
+def _get_psutil():
+    """
+    Import psutil on first use.
+
+    Only the deprecated collectors need psutil, so the CLI does not pay for
+    importing it. Returns None if psutil is not installed.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
+
+
+@functools.lru_cache(maxsize=1)
+def _cpu_count() -> int:
+    """Number of logical CPUs; fixed for the life of the process."""
+    return _get_psutil().cpu_count() or 1
+
+
+# Whether psutil.cpu_percent() has a baseline sample to measure against
+_cpu_primed = False
+
+
+def _prime_cpu_percent() -> None:
+    """Take the baseline sample that non-blocking cpu_percent() calls measure from."""
+    global _cpu_primed
+    psutil = _get_psutil()
+    if psutil is not None and not _cpu_primed:
+        psutil.cpu_percent(interval=None)
+        _cpu_primed = True
+
+
+def _cpu_percent() -> float:
+    """
+    CPU usage since the previous call, without blocking.
+
+    Only the very first call in a process, with no baseline sample yet,
+    blocks for a one second measurement.
+    """
+    global _cpu_primed
+    psutil = _get_psutil()
+    if not _cpu_primed:
+        _cpu_primed = True
+        return psutil.cpu_percent(interval=1)
+    return psutil.cpu_percent(interval=None)
+
+
+def _default_disk_path() -> str:
+    """Return the default disk path to monitor for the current platform."""
+    return "C:\\" if os.name == 'nt' else "/"
+
+
+@dataclass
+class SystemSnapshot:
+    """
+    Point-in-time system readings shared by the psutil-based collectors.
+
+    Taking one snapshot per collection cycle lets every collector read the
+    same values instead of issuing its own psutil call.
+    """
+    cpu_percent: float = 0.0
+    memory: Any = None      # psutil.virtual_memory() result
+    network: Any = None     # psutil.net_io_counters() result
+    disk: Any = None        # psutil.disk_usage(disk_path) result
+    disk_path: str = ""
+    load_average: float = 0.0
+    process_count: int = 0
+
+
+def _read_disk(snapshot: 'LazySystemSnapshot') -> Any:
+    """Read disk usage for the snapshot's path, or None if it cannot be read."""
+    try:
+        return _get_psutil().disk_usage(snapshot.disk_path)
+    except Exception:
+        return None
+
+
+def _read_load_average(snapshot: 'LazySystemSnapshot') -> float:
+    """Read the 1-minute load average, estimating it from the snapshot's CPU on Windows."""
+    try:
+        return _get_psutil().getloadavg()[0]
+    except (AttributeError, OSError):
+        # getloadavg not available on Windows; reuse the snapshot's CPU
+        # reading so psutil's cpu_percent baseline is only sampled once
+        return snapshot.cpu_percent / 100.0 * _cpu_count()
+
+
+class LazySystemSnapshot:
+    """
+    SystemSnapshot whose readings are taken on first access.
+
+    This is the one place system readings are taken: snapshot_system() and
+    the collectors' live reads go through it too. MetricRegistry.collect_all
+    shares one per call, so collectors reading the same psutil result
+    (memory percent and used, bytes received and sent) cause a single
+    psutil call between them, and readings no collector needs are never
+    taken.
+    """
+
+    # SystemSnapshot field -> reader
+    _READERS: Dict[str, Callable[['LazySystemSnapshot'], Any]] = {
+        'cpu_percent': lambda s: _cpu_percent(),
+        'memory': lambda s: _get_psutil().virtual_memory(),
+        'network': lambda s: _get_psutil().net_io_counters(),
+        'disk': _read_disk,
+        'load_average': _read_load_average,
+        'process_count': lambda s: len(_get_psutil().pids()),
+    }
+
+    def __init__(self, disk_path: str = None):
+        self.disk_path = disk_path or _default_disk_path()
+        # Reentrant: the Windows load average reads cpu_percent
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for readings not taken yet; later reads hit __dict__
+        reader = self._READERS.get(name)
+        if reader is None:
+            raise AttributeError(name)
+        with self._lock:
+            if name not in self.__dict__:
+                if _get_psutil() is None:
+                    self.__dict__[name] = getattr(SystemSnapshot(), name)
+                else:
+                    self.__dict__[name] = reader(self)
+            return self.__dict__[name]
+
+
+def snapshot_system(disk_path: str = None) -> SystemSnapshot:
+    """
+    Read all system metrics in a single pass.
+
+    Args:
+        disk_path: Disk path to sample (default: system drive / root)
+
+    Returns:
+        SystemSnapshot with the current readings (zeroed if psutil is unavailable)
+    """
+    lazy = LazySystemSnapshot(disk_path)
+    return SystemSnapshot(
+        disk_path=lazy.disk_path,
+        **{name: getattr(lazy, name) for name in LazySystemSnapshot._READERS}
+    )
 
 
 def _deprecated_warning(class_name: str):
@@ -164,221 +541,375 @@ def _deprecated_warning(class_name: str):
     )
 
 
-class CPUPercentCollector(MetricCollector):
+def _live_reader(extract: Callable[[SystemSnapshot], Any]) -> Callable[[str], Any]:
+    """Read a metric now for a disk path, through a fresh LazySystemSnapshot."""
+    return lambda path: extract(LazySystemSnapshot(path))
+
+
+# The psutil-based system metrics: metric name -> (unit, read from a SystemSnapshot).
+# Reading from an empty SystemSnapshot yields the fallback value.
+_SYSTEM_METRIC_EXTRACTORS: Dict[str, Tuple[str, Callable[[SystemSnapshot], Any]]] = {
+    'cpu_percent': ('%', lambda s: s.cpu_percent),
+    'memory_percent': ('%', lambda s: s.memory.percent if s.memory is not None else 0.0),
+    'memory_used': ('bytes', lambda s: s.memory.used if s.memory is not None else 0),
+    'disk_percent': ('%', lambda s: s.disk.percent if s.disk is not None else 0.0),
+    'disk_used': ('bytes', lambda s: s.disk.used if s.disk is not None else 0),
+    'network_bytes_recv': ('bytes', lambda s: s.network.bytes_recv if s.network is not None else 0),
+    'network_bytes_sent': ('bytes', lambda s: s.network.bytes_sent if s.network is not None else 0),
+    # Node is up if the collection runs at all
+    'node_status': ('', lambda s: 1),
+    'load_average': ('', lambda s: s.load_average),
+    'process_count': ('', lambda s: s.process_count),
+}
+
+# Table of the psutil-based system metrics:
+# metric name -> (unit, read from a SystemSnapshot, read live for a disk path).
+# Live reads take only the readings their metric needs.
+SYSTEM_METRICS: Dict[str, Tuple[str, Callable[[SystemSnapshot], Any], Callable[[str], Any]]] = {
+    name: (unit, extract, _live_reader(extract))
+    for name, (unit, extract) in _SYSTEM_METRIC_EXTRACTORS.items()
+}
+
+
+class _SystemMetricCollector(MetricCollector):
     """
-    DEPRECATED: Collects CPU usage percentage.
-    This collector is deprecated. Use ClickHouseStatusCollector instead.
+    DEPRECATED: Base for the psutil collectors, driven by SYSTEM_METRICS.
+    Subclasses only name their metric.
     """
 
+    metric_name: str = ""
+
     def __init__(self, interval: int = 60):
-        _deprecated_warning("CPUPercentCollector")
-        super().__init__(name="cpu_percent", unit="%", interval=interval)
+        _deprecated_warning(type(self).__name__)
+        self._setup(interval)
+        self.path = None
+
+    def _setup(self, interval: int) -> None:
+        unit, self._extract, self._read_live = SYSTEM_METRICS[self.metric_name]
+        super().__init__(name=self.metric_name, unit=unit, interval=interval)
 
     def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        if PSUTIL_AVAILABLE:
-            value = psutil.cpu_percent(interval=1)
+        snapshot = kwargs.get('snapshot')
+        if snapshot is not None and (self.path is None or snapshot.disk_path == self.path):
+            value = self._extract(snapshot)
+        elif _get_psutil() is not None:
+            value = self._read_live(self.path)
         else:
-            value = 0.0
-        return self._create_metric(node_name, cluster_name, value)
+            value = self._extract(SystemSnapshot())
+        return self._create_metric(node_name, cluster_name, value, kwargs.get('timestamp'))
+
+
+class _DiskMetricCollector(_SystemMetricCollector):
+    """DEPRECATED: Base for the psutil collectors that sample a disk path."""
+
+    def __init__(self, path: str = None, interval: int = 60):
+        _deprecated_warning(type(self).__name__)
+        self._setup(interval)
+        self.path = path or _default_disk_path()
 
 
-class MemoryPercentCollector(MetricCollector):
+class CPUPercentCollector(_SystemMetricCollector):
     """
-    DEPRECATED: Collects memory usage percentage.
+    DEPRECATED: Collects CPU usage percentage.
     This collector is deprecated. Use ClickHouseStatusCollector instead.
     """
+    metric_name = "cpu_percent"
 
     def __init__(self, interval: int = 60):
-        _deprecated_warning("MemoryPercentCollector")
-        super().__init__(name="memory_percent", unit="%", interval=interval)
-
-    def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        if PSUTIL_AVAILABLE:
-            value = psutil.virtual_memory().percent
-        else:
-            value = 0.0
-        return self._create_metric(node_name, cluster_name, value)
+        super().__init__(interval)
+        # Prime now so the first collect() does not block to take a baseline
+        _prime_cpu_percent()
 
 
-class MemoryUsedCollector(MetricCollector):
+class MemoryPercentCollector(_SystemMetricCollector):
     """
-    DEPRECATED: Collects memory used in bytes.
+    DEPRECATED: Collects memory usage percentage.
     This collector is deprecated. Use ClickHouseStatusCollector instead.
     """
+    metric_name = "memory_percent"
 
-    def __init__(self, interval: int = 60):
-        _deprecated_warning("MemoryUsedCollector")
-        super().__init__(name="memory_used", unit="bytes", interval=interval)
 
-    def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        if PSUTIL_AVAILABLE:
-            value = psutil.virtual_memory().used
-        else:
-            value = 0
-        return self._create_metric(node_name, cluster_name, value)
+class MemoryUsedCollector(_SystemMetricCollector):
+    """
+    DEPRECATED: Collects memory used in bytes.
+    This collector is deprecated. Use ClickHouseStatusCollector instead.
+    """
+    metric_name = "memory_used"
 
 
-class DiskPercentCollector(MetricCollector):
+class DiskPercentCollector(_DiskMetricCollector):
     """
     DEPRECATED: Collects disk usage percentage.
     This collector is deprecated. Use ClickHouseStatusCollector instead.
     """
+    metric_name = "disk_percent"
 
-    def __init__(self, path: str = None, interval: int = 60):
-        _deprecated_warning("DiskPercentCollector")
-        super().__init__(name="disk_percent", unit="%", interval=interval)
-        self.path = path or ("C:\\" if os.name == 'nt' else "/")
-
-    def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        if PSUTIL_AVAILABLE:
-            try:
-                value = psutil.disk_usage(self.path).percent
-            except Exception:
-                value = 0.0
-        else:
-            value = 0.0
-        return self._create_metric(node_name, cluster_name, value)
 
-
-class DiskUsedCollector(MetricCollector):
+class DiskUsedCollector(_DiskMetricCollector):
     """
     DEPRECATED: Collects disk used in bytes.
     This collector is deprecated. Use ClickHouseStatusCollector instead.
     """
+    metric_name = "disk_used"
 
-    def __init__(self, path: str = None, interval: int = 60):
-        _deprecated_warning("DiskUsedCollector")
-        super().__init__(name="disk_used", unit="bytes", interval=interval)
-        self.path = path or ("C:\\" if os.name == 'nt' else "/")
-
-    def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        if PSUTIL_AVAILABLE:
-            try:
-                value = psutil.disk_usage(self.path).used
-            except Exception:
-                value = 0
-        else:
-            value = 0
-        return self._create_metric(node_name, cluster_name, value)
 
-
-class NetworkBytesRecvCollector(MetricCollector):
+class NetworkBytesRecvCollector(_SystemMetricCollector):
     """
     DEPRECATED: Collects network bytes received.
     This collector is deprecated. Use ClickHouseStatusCollector instead.
     """
-
-    def __init__(self, interval: int = 60):
-        _deprecated_warning("NetworkBytesRecvCollector")
-        super().__init__(name="network_bytes_recv", unit="bytes", interval=interval)
-
-    def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        if PSUTIL_AVAILABLE:
-            value = psutil.net_io_counters().bytes_recv
-        else:
-            value = 0
-        return self._create_metric(node_name, cluster_name, value)
+    metric_name = "network_bytes_recv"
 
 
-class NetworkBytesSentCollector(MetricCollector):
+class NetworkBytesSentCollector(_SystemMetricCollector):
     """
     DEPRECATED: Collects network bytes sent.
     This collector is deprecated. Use ClickHouseStatusCollector instead.
     """
-
-    def __init__(self, interval: int = 60):
-        _deprecated_warning("NetworkBytesSentCollector")
-        super().__init__(name="network_bytes_sent", unit="bytes", interval=interval)
-
-    def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        if PSUTIL_AVAILABLE:
-            value = psutil.net_io_counters().bytes_sent
-        else:
-            value = 0
-        return self._create_metric(node_name, cluster_name, value)
+    metric_name = "network_bytes_sent"
 
 
-class NodeStatusCollector(MetricCollector):
+class NodeStatusCollector(_SystemMetricCollector):
     """
     DEPRECATED: Collects node status (1 = up, 0 = down).
     This collector is deprecated. Use ClickHouseStatusCollector instead.
     """
-
-    def __init__(self, interval: int = 60):
-        _deprecated_warning("NodeStatusCollector")
-        super().__init__(name="node_status", unit="", interval=interval)
-
-    def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        # Node is up if this collector runs successfully
-        return self._create_metric(node_name, cluster_name, 1)
+    metric_name = "node_status"
 
 
-class LoadAverageCollector(MetricCollector):
+class LoadAverageCollector(_SystemMetricCollector):
     """
     DEPRECATED: Collects system load average.
     This collector is deprecated. Use ClickHouseStatusCollector instead.
     """
-
-    def __init__(self, interval: int = 60):
-        _deprecated_warning("LoadAverageCollector")
-        super().__init__(name="load_average", unit="", interval=interval)
-
-    def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        if PSUTIL_AVAILABLE:
-            try:
-                value = psutil.getloadavg()[0]
-            except (AttributeError, OSError):
-                # getloadavg not available on Windows
-                value = psutil.cpu_percent() / 100.0 * psutil.cpu_count()
-        else:
-            value = 0.0
-        return self._create_metric(node_name, cluster_name, value)
+    metric_name = "load_average"
 
 
-class ProcessCountCollector(MetricCollector):
+class ProcessCountCollector(_SystemMetricCollector):
     """
     DEPRECATED: Collects number of running processes.
     This collector is deprecated. Use ClickHouseStatusCollector instead.
     """
+    metric_name = "process_count"
 
     def __init__(self, interval: int = 60):
-        _deprecated_warning("ProcessCountCollector")
-        super().__init__(name="process_count", unit="", interval=interval)
+        super().__init__(interval)
+        self._count: Optional[int] = None
+        self._counted_at = 0.0
+        self._read_live = self._read_count
 
-    def collect(self, node_name: str, cluster_name: str, **kwargs) -> MetricValue:
-        if PSUTIL_AVAILABLE:
-            value = len(psutil.pids())
-        else:
-            value = 0
-        return self._create_metric(node_name, cluster_name, value)
+    def _read_count(self, path: str) -> int:
+        """Count processes, reusing the last count for half a collection interval."""
+        now = time.monotonic()
+        if self._count is None or now - self._counted_at >= self.interval / 2:
+            self._count = len(_get_psutil().pids())
+            self._counted_at = now
+        return self._count
 
 
 class MetricStorage:
-    """Handles storage of metrics to CSV-style log files organized by directory hierarchy."""
+    """
+    Handles storage of metrics to CSV-style log files organized by directory hierarchy.
+
+    Durability: writes go to the OS page cache and are not fsync'ed by
+    default. With durable=True, store_batch fsyncs each file it touched once
+    after writing it, so a batch costs one fsync per log file rather than
+    one per metric, and store() fsyncs its file before returning.
+
+    Next to each log file written by this class, a small HH.log.idx sidecar
+    records the file's earliest and latest timestamps and its metric names,
+    so query() can skip hours that cannot match without reading them.
+    """
 
     # CSV header format - only 3 columns: metric_name, timestamp, value
     CSV_HEADER = "# metric_name,timestamp,value"
 
-    def __init__(self, base_dir: str = "data/metrics"):
+    # Suffix of a log file's index sidecar
+    INDEX_SUFFIX = ".idx"
+
+    # Number of write locks log files are spread over
+    LOCK_STRIPES = 64
+
+    # Byte locked on Windows to hold a log file's lock. It lies past any
+    # real data, so the (mandatory) Windows lock never blocks readers.
+    WINDOWS_LOCK_OFFSET = 0x7FFFFFFE
+
+    def __init__(self, base_dir: str = "data/metrics", durable: bool = False):
         self.base_dir = base_dir
-        self._lock = threading.Lock()
+        self.durable = durable
+        # Writes to different log files do not wait for each other: each file
+        # hashes to one of a fixed set of locks, so the lock count stays bounded
+        self._file_locks = tuple(threading.Lock() for _ in range(self.LOCK_STRIPES))
+        # Directories already created by this instance
+        self._created_dirs: set = set()
+        # Log files without a usable index sidecar
+        self._unindexed: set = set()
+        # Directory -> (mtime_ns, subdirectory names) for list_clusters/list_nodes
+        self._listings: Dict[str, Tuple[int, List[str]]] = {}
         os.makedirs(base_dir, exist_ok=True)
 
-    def _get_file_path(self, metric: MetricValue, timestamp: datetime) -> str:
+    def _compute_path(self, cluster_name: str, node_name: str, ts: str) -> str:
         """
         Generate file path with all context in directory structure.
         Format: base_dir/cluster_name/node_name/YYYY/MM/DD/HH.log
+
+        The date and hour are sliced straight out of the ISO timestamp;
+        only timestamps not shaped like YYYY-MM-DDTHH go through datetime.
+        Does not touch the file system.
         """
-        date_dir = timestamp.strftime("%Y/%m/%d")
-        hour_file = timestamp.strftime("%H") + ".log"
-        dir_path = os.path.join(
-            self.base_dir, 
-            metric.cluster_name, 
-            metric.node_name, 
-            date_dir
-        )
-        os.makedirs(dir_path, exist_ok=True)
-        return os.path.join(dir_path, hour_file)
+        if len(ts) >= 13 and ts[4] == '-' and ts[7] == '-' and ts[10] in 'T ':
+            date_dir = f"{ts[0:4]}/{ts[5:7]}/{ts[8:10]}"
+            hour_file = ts[11:13] + ".log"
+        else:
+            timestamp = datetime.fromisoformat(ts)
+            date_dir = timestamp.strftime("%Y/%m/%d")
+            hour_file = timestamp.strftime("%H") + ".log"
+        return os.path.join(self.base_dir, cluster_name, node_name, date_dir, hour_file)
+
+    def _ensure_dir(self, dir_path: str) -> None:
+        """Create a log directory unless this instance already did."""
+        if dir_path not in self._created_dirs:
+            os.makedirs(dir_path, exist_ok=True)
+            self._created_dirs.add(dir_path)
+
+    def _get_file_path(self, metric: MetricValue) -> str:
+        """Path of the log file for a metric, creating its directory if needed."""
+        file_path = self._compute_path(metric.cluster_name, metric.node_name, metric.timestamp)
+        self._ensure_dir(os.path.dirname(file_path))
+        return file_path
+
+    def _file_lock(self, file_path: str) -> threading.Lock:
+        """Lock serializing writes to a log file."""
+        return self._file_locks[hash(file_path) % len(self._file_locks)]
+
+    @classmethod
+    def _read_index(cls, file_path: str) -> Optional[Dict[str, Any]]:
+        """Read a log file's index sidecar, or None if it is missing or unreadable."""
+        try:
+            with open(file_path + cls.INDEX_SUFFIX, 'rb') as f:
+                data = json_loads(f.read())
+            return {
+                'min_ts': data['min_ts'],
+                'max_ts': data['max_ts'],
+                'metric_names': set(data['metric_names']),
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _widen_index(self, file_path: str, new_file: bool,
+                     metrics: List[MetricValue]) -> None:
+        """
+        Widen a log file's index sidecar to cover metrics about to be appended.
+
+        Runs before the rows are written, so the sidecar never covers less
+        than the file even if the process dies in between; covering more is
+        harmless. The sidecar on disk is re-read, merged and replaced while
+        the log file is locked (see _open_log), so writers in other
+        processes or other MetricStorage instances sharing the data
+        directory keep each other's timestamps and metric names. If the
+        sidecar cannot be written it is removed and the file is scanned in
+        full from then on. Existing files without a sidecar stay unindexed,
+        since their earlier rows are unknown. Must be called with the log
+        file locked.
+        """
+        if new_file:
+            self._unindexed.discard(file_path)
+        elif file_path in self._unindexed:
+            return
+
+        index = self._read_index(file_path)
+        if index is None:
+            if not new_file:
+                self._unindexed.add(file_path)
+                return
+            index = {'min_ts': None, 'max_ts': None, 'metric_names': set()}
+
+        timestamps = [m.timestamp for m in metrics]
+        names = {m.metric_name for m in metrics}
+        lo, hi = min(timestamps), max(timestamps)
+        if (index['min_ts'] is not None and index['min_ts'] <= lo
+                and hi <= index['max_ts'] and names <= index['metric_names']):
+            return
+        index['min_ts'] = lo if index['min_ts'] is None else min(index['min_ts'], lo)
+        index['max_ts'] = hi if index['max_ts'] is None else max(index['max_ts'], hi)
+        index['metric_names'] |= names
+
+        index_path = file_path + self.INDEX_SUFFIX
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path),
+                                            prefix=os.path.basename(index_path) + '.',
+                                            suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json_dumps({
+                    'min_ts': index['min_ts'],
+                    'max_ts': index['max_ts'],
+                    'metric_names': sorted(index['metric_names']),
+                }))
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            logger.warning("Failed to update metric index %s, dropping it: %s", index_path, e)
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            self._drop_index(file_path)
+
+    def _drop_index(self, file_path: str) -> None:
+        """Remove a log file's sidecar so queries scan the file in full."""
+        self._unindexed.add(file_path)
+        path = file_path + self.INDEX_SUFFIX
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error("Failed to remove stale metric index %s: %s", path, e)
+
+    @classmethod
+    @contextmanager
+    def _open_log(cls, file_path: str):
+        """
+        Open a log file for appending and lock it against other writers.
+
+        The lock is taken on the log file itself, so it also serializes
+        writers in other processes and other MetricStorage instances. It is
+        held until the block exits; yields the file descriptor.
+        """
+        fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield fd
+            else:
+                # msvcrt locks from the current position; appends move it
+                os.lseek(fd, cls.WINDOWS_LOCK_OFFSET, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                try:
+                    yield fd
+                finally:
+                    os.lseek(fd, cls.WINDOWS_LOCK_OFFSET, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            # Closing the descriptor also releases the POSIX lock
+            os.close(fd)
+
+    @staticmethod
+    def _append(fd: int, data: str, fsync: bool = False) -> None:
+        """
+        Append data to an open log file with a single unbuffered write.
+
+        O_APPEND makes each write land at the end of the file, so the
+        buffered text layer of open() is not needed. With fsync=True the
+        file is flushed to disk before returning.
+        """
+        payload = data.encode('utf-8')
+        while payload:
+            written = os.write(fd, payload)
+            payload = payload[written:]
+        if fsync:
+            os.fsync(fd)
 
     def _metric_to_csv_line(self, metric: MetricValue) -> str:
         """Convert a metric to CSV line format (only 3 columns)."""
@@ -409,139 +940,89 @@ class MetricStorage:
             return None
 
     def store(self, metric: MetricValue) -> None:
-        """Store a single metric value (append to log file)."""
-        timestamp = datetime.fromisoformat(metric.timestamp)
-        file_path = self._get_file_path(metric, timestamp)
-
-        with self._lock:
-            # Check if file exists and has header
-            file_exists = os.path.exists(file_path)
-            
-            with open(file_path, 'a', encoding='utf-8') as f:
-                if not file_exists:
-                    f.write(self.CSV_HEADER + '\n')
-                f.write(self._metric_to_csv_line(metric) + '\n')
-
-    def store_batch(self, metrics: List[MetricValue]) -> None:
-        """Store multiple metrics efficiently."""
-        for metric in metrics:
-            self.store(metric)
-
-
-class JsonMetricStorage:
-    """
-    Handles storage of metrics to JSON files.
-    
-    Directory structure: <base_dir>/<cluster>/<year>/<month>/<day>/ServceLogs_<timestamp>.json
-    JSON format: Array of {clustername, machinename, metricname, metricvalue, logtime}
-
-    """
-    
-    # Metric ID definition
-    METRIC_ID_PING = "ch_ping"
-    
-    # Default log root directory
-    DEFAULT_LOG_ROOT = r"D:\ServiceHealthMatrixLogs"
+        """
+        Store a single metric value (append to log file).
 
-    def __init__(self, base_dir: str = None):
-        self.base_dir = base_dir or self.DEFAULT_LOG_ROOT
-        self._lock = threading.Lock()
+        Args:
+            metric: Metric to store
+        """
+        file_path = self._get_file_path(metric)
 
-    def _format_metric_json(self, metric: MetricValue, metric_id: str = None) -> dict:
-        """Format metric as JSON object."""
-        return {
-            "clustername": metric.cluster_name,
-            "machinename": metric.node_name,
-            "metricname": metric_id or self.METRIC_ID_PING,
-            "metricvalue": metric.value,
-            "logtime": metric.timestamp[:19]  # YYYY-MM-DDTHH:MM:SS
-        }
+        line = self._metric_to_csv_line(metric) + '\n'
+        with self._file_lock(file_path), self._open_log(file_path) as fd:
+            # Prepend the header the first time this file is written
+            new_file = os.fstat(fd).st_size == 0
+            if new_file:
+                line = self.CSV_HEADER + '\n' + line
+            self._widen_index(file_path, new_file, [metric])
+            self._append(fd, line, fsync=self.durable)
 
-    def _get_file_path(self, cluster_name: str, timestamp: datetime = None) -> str:
-        """
-        Generate JSON file path.
-        Format: <base_dir>/<cluster>/<year>/<month>/<day>/ServceLogs_<timestamp>.json
+    def store_batch(self, metrics: List[MetricValue]) -> None:
         """
-        if timestamp is None:
-            timestamp = datetime.utcnow()
-        
-        year = timestamp.strftime("%Y")
-        month = timestamp.strftime("%m")
-        day = timestamp.strftime("%d")
-        time_str = timestamp.strftime("%Y%m%d%H%M")
-        
-        # Directory structure: <base_dir>/<cluster>/<year>/<month>/<day>/
-        date_dir = os.path.join(self.base_dir, cluster_name, year, month, day)
-        os.makedirs(date_dir, exist_ok=True)
-        
-        # Filename: ServceLogs_<timestamp>.json
-        return os.path.join(date_dir, f"ServceLogs_{time_str}.json")
+        Store multiple metrics efficiently.
 
-    def store_batch(self, metrics: List[MetricValue], metric_id: str = None) -> str:
-        """
-        Store multiple metrics to a single JSON file.
-        
-        Args:
-            metrics: List of MetricValue objects
-            metric_id: Optional metric ID (default: ch_ping)
-        
-        Returns:
-            Path to the saved JSON file
+        Metrics are grouped by (cluster, node, hour) so the destination path is
+        resolved once per group and each log file is opened and written once
+        per batch instead of once per metric.
         """
-        if not metrics:
-            return None
-        
-        # Use cluster_name from the first metric
-        cluster_name = metrics[0].cluster_name
-        now = datetime.utcnow()
-        json_file = self._get_file_path(cluster_name, now)
-        
-        # Build JSON data
-        json_data = [self._format_metric_json(m, metric_id) for m in metrics]
-        
-        with self._lock:
-            # Write JSON file (overwrite, no incremental append)
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
-        
-        return json_file
+        groups: Dict[tuple, List[MetricValue]] = defaultdict(list)
+        for metric in metrics:
+            # ISO timestamps share their first 13 chars (YYYY-MM-DDTHH) within an hour
+            groups[(metric.cluster_name, metric.node_name, metric.timestamp[:13])].append(metric)
 
-    def store(self, metric: MetricValue, metric_id: str = None) -> str:
-        """Store a single metric value to JSON file."""
-        return self.store_batch([metric], metric_id)
+        metrics_by_file: Dict[str, List[MetricValue]] = {}
+        for group in groups.values():
+            first = group[0]
+            file_path = self._get_file_path(first)
+            metrics_by_file.setdefault(file_path, []).extend(group)
 
-    def _get_query_file_path(self, cluster_name: str, node_name: str, timestamp: datetime) -> str:
-        """Generate file path for querying based on cluster, node, and hour."""
-        date_dir = timestamp.strftime("%Y/%m/%d")
-        hour_file = timestamp.strftime("%H") + ".log"
-        return os.path.join(self.base_dir, cluster_name, node_name, date_dir, hour_file)
+        for file_path, file_metrics in metrics_by_file.items():
+            lines = [self._metric_to_csv_line(metric) + '\n' for metric in file_metrics]
+            with self._file_lock(file_path), self._open_log(file_path) as fd:
+                new_file = os.fstat(fd).st_size == 0
+                if new_file:
+                    lines.insert(0, self.CSV_HEADER + '\n')
+
+                self._widen_index(file_path, new_file, file_metrics)
+                self._append(fd, ''.join(lines), fsync=self.durable)
 
     def query(self, cluster_name: str, node_name: str,
               start_time: datetime, end_time: datetime,
               metric_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """Query stored metrics within a time range."""
         results = []
-        current = start_time.replace(minute=0, second=0, microsecond=0)
-
-        while current <= end_time:
-            file_path = self._get_query_file_path(cluster_name, node_name, current)
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            m = self._csv_line_to_metric(line, cluster_name, node_name)
-                            if m is None:
-                                continue
-                            m_time = datetime.fromisoformat(m['timestamp'])
-                            if start_time <= m_time <= end_time:
-                                if metric_name is None or m['metric_name'] == metric_name:
-                                    results.append(m)
-                except IOError:
-                    pass
-
-            # Move to next hour
-            current = current.replace(hour=current.hour + 1) if current.hour < 23 else \
-                current.replace(day=current.day + 1, hour=0)
+        # Stored timestamps are ISO-8601 strings from isoformat(), which sort
+        # like the datetimes they encode, so rows are compared as strings
+        start_s = start_time.isoformat()
+        end_s = end_time.isoformat()
+
+        # One log file per hour in the range; reading never creates directories
+        first_hour = start_time.replace(minute=0, second=0, microsecond=0)
+        hours = int((end_time - first_hour) // timedelta(hours=1)) + 1 if end_time >= first_hour else 0
+        file_paths = [
+            self._compute_path(cluster_name, node_name, (first_hour + timedelta(hours=i)).isoformat())
+            for i in range(hours)
+        ]
+
+        for file_path in file_paths:
+            # Skip hours whose index rules out any match
+            index = self._read_index(file_path)
+            if index is not None and (
+                    index['max_ts'] < start_s or index['min_ts'] > end_s
+                    or (metric_name is not None and metric_name not in index['metric_names'])):
+                continue
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        m = self._csv_line_to_metric(line, cluster_name, node_name)
+                        if m is None:
+                            continue
+                        if start_s <= m['timestamp'] <= end_s:
+                            if metric_name is None or m['metric_name'] == metric_name:
+                                results.append(m)
+            except IOError:
+                # Hours without a log file are skipped
+                pass
 
         return sorted(results, key=lambda x: x['timestamp'])
 
@@ -555,8 +1036,7 @@ class JsonMetricStorage:
 
         if not metrics:
             # Try previous hour if no data in current hour
-            prev_hour = start_time.replace(hour=start_time.hour - 1) if start_time.hour > 0 else \
-                start_time.replace(day=start_time.day - 1, hour=23)
+            prev_hour = start_time - timedelta(hours=1)
             metrics = self.query(cluster_name, node_name, prev_hour, start_time, metric_name)
 
         return metrics
@@ -636,24 +1116,138 @@ class JsonMetricStorage:
             'last_check': timeline[-1]['timestamp'] if timeline else None
         }
 
+    def _list_subdirs(self, dir_path: str) -> List[str]:
+        """
+        Names of the subdirectories of dir_path (empty if it does not exist).
+
+        A directory's mtime changes whenever an entry is added or removed,
+        so the listing is cached until it does: a repeated call costs one
+        stat() instead of a scan. Scanning uses scandir(), whose entries
+        know their type without a stat() each.
+        """
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return []
+        cached = self._listings.get(dir_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return list(cached[1])
+        with os.scandir(dir_path) as entries:
+            names = [entry.name for entry in entries if entry.is_dir()]
+        self._listings[dir_path] = (mtime_ns, names)
+        return list(names)
+
     def list_clusters(self) -> List[str]:
         """List all cluster names."""
-        clusters = []
-        if os.path.exists(self.base_dir):
-            for name in os.listdir(self.base_dir):
-                if os.path.isdir(os.path.join(self.base_dir, name)):
-                    clusters.append(name)
-        return clusters
+        return self._list_subdirs(self.base_dir)
 
     def list_nodes(self, cluster_name: str) -> List[str]:
         """List all nodes in a cluster."""
-        nodes = []
-        cluster_dir = os.path.join(self.base_dir, cluster_name)
-        if os.path.exists(cluster_dir):
-            for name in os.listdir(cluster_dir):
-                if os.path.isdir(os.path.join(cluster_dir, name)):
-                    nodes.append(name)
-        return nodes
+        return self._list_subdirs(os.path.join(self.base_dir, cluster_name))
+
+
+class JsonMetricStorage:
+    """
+    Handles storage of metrics to JSON files.
+    
+    Directory structure: <base_dir>/<cluster>/<year>/<month>/<day>/ServceLogs_<timestamp>.json
+    JSON format: Array of {clustername, machinename, metricname, metricvalue, logtime}
+
+    The same records can be written as NDJSON (.ndjson) or CBOR (.cbor)
+    instead, see SERIALIZERS.
+
+    """
+    
+    # Metric ID definition
+    METRIC_ID_PING = "ch_ping"
+    
+    # Default log root directory
+    DEFAULT_LOG_ROOT = r"D:\ServiceHealthMatrixLogs"
+
+    def __init__(self, base_dir: str = None, pretty: bool = False, fmt: str = 'json'):
+        """
+        Args:
+            base_dir: Log root directory (default: DEFAULT_LOG_ROOT)
+            pretty: Write indented JSON instead of compact JSON
+            fmt: File format, one of SERIALIZERS (default: json)
+        """
+        self.base_dir = base_dir or self.DEFAULT_LOG_ROOT
+        self.pretty = pretty
+        self.serializer = get_serializer(fmt, pretty=pretty)
+        self._lock = threading.Lock()
+        # Directories already created by this instance
+        self._created_dirs: set = set()
+
+    def _format_metric_json(self, metric: MetricValue, metric_id: str = None) -> dict:
+        """Format metric as JSON object."""
+        return {
+            "clustername": metric.cluster_name,
+            "machinename": metric.node_name,
+            "metricname": metric_id or self.METRIC_ID_PING,
+            "metricvalue": metric.value,
+            "logtime": metric.timestamp[:19]  # YYYY-MM-DDTHH:MM:SS
+        }
+
+    def _get_file_path(self, cluster_name: str, timestamp: datetime = None) -> str:
+        """
+        Generate JSON file path.
+        Format: <base_dir>/<cluster>/<year>/<month>/<day>/ServceLogs_<timestamp>.<ext>
+        """
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+        
+        year = timestamp.strftime("%Y")
+        month = timestamp.strftime("%m")
+        day = timestamp.strftime("%d")
+        time_str = timestamp.strftime("%Y%m%d%H%M")
+        
+        # Directory structure: <base_dir>/<cluster>/<year>/<month>/<day>/
+        date_dir = os.path.join(self.base_dir, cluster_name, year, month, day)
+        if date_dir not in self._created_dirs:
+            os.makedirs(date_dir, exist_ok=True)
+            self._created_dirs.add(date_dir)
+        
+        # Filename: ServceLogs_<timestamp>.<ext>
+        return os.path.join(date_dir, f"ServceLogs_{time_str}.{self.serializer.extension}")
+
+    def store_batch(self, metrics: List[MetricValue], metric_id: str = None) -> str:
+        """
+        Store multiple metrics to a single JSON file per cluster.
+
+        Metrics are grouped by cluster so each cluster's file is serialized
+        and written once, and metrics of other clusters in the same batch
+        land in their own cluster directory.
+        
+        Args:
+            metrics: List of MetricValue objects
+            metric_id: Optional metric ID (default: ch_ping)
+        
+        Returns:
+            Path to the saved JSON file of the first metric's cluster
+        """
+        if not metrics:
+            return None
+        
+        # Build JSON data per cluster (dicts keep first-seen cluster order)
+        data_by_cluster: Dict[str, List[dict]] = defaultdict(list)
+        for m in metrics:
+            data_by_cluster[m.cluster_name].append(self._format_metric_json(m, metric_id))
+
+        now = datetime.utcnow()
+        json_file = None
+        with self._lock:
+            for cluster_name, json_data in data_by_cluster.items():
+                cluster_file = self._get_file_path(cluster_name, now)
+                # Write JSON file (overwrite, no incremental append)
+                with open(cluster_file, 'wb') as f:
+                    f.write(self.serializer.dumps(json_data))
+                json_file = json_file or cluster_file
+        
+        return json_file
+
+    def store(self, metric: MetricValue, metric_id: str = None) -> str:
+        """Store a single metric value to JSON file."""
+        return self.store_batch([metric], metric_id)
 
 
 class MetricRegistry:
@@ -679,17 +1273,47 @@ class MetricRegistry:
         """Get all registered collectors."""
         return list(self._collectors.values())
 
-    def collect_all(self, node_name: str, cluster_name: str) -> List[MetricValue]:
-        """Collect all metrics for a node."""
-        metrics = []
-        for collector in self._collectors.values():
-            try:
-                metric = collector.collect(node_name, cluster_name)
-                metrics.append(metric)
-            except Exception:
-                # Log error but continue with other collectors
-                pass
-        return metrics
+    def collect_all(self, node_name: str, cluster_name: str,
+                    timestamp: Optional[str] = None) -> List[MetricValue]:
+        """
+        Collect all metrics for a node.
+
+        Collectors block on I/O, so with more than one registered they run
+        concurrently and the node takes as long as its slowest collector.
+        Metrics are returned in registration order.
+
+        The collectors share one LazySystemSnapshot, so system readings they
+        have in common are taken once per call, and one timestamp.
+
+        Args:
+            timestamp: ISO timestamp for all metrics (default: now)
+        """
+        collectors = list(self._collectors.values())
+        snapshot = LazySystemSnapshot()
+        timestamp = timestamp or datetime.utcnow().isoformat()
+        if len(collectors) <= 1:
+            results = [self._collect_one(c, node_name, cluster_name, snapshot, timestamp)
+                       for c in collectors]
+        else:
+            with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+                results = list(executor.map(
+                    lambda c: self._collect_one(c, node_name, cluster_name, snapshot, timestamp),
+                    collectors
+                ))
+        return [metric for metric in results if metric is not None]
+
+    @staticmethod
+    def _collect_one(collector: MetricCollector, node_name: str, cluster_name: str,
+                     snapshot: Optional[LazySystemSnapshot] = None,
+                     timestamp: Optional[str] = None) -> Optional[MetricValue]:
+        """Run one collector, returning None if it fails."""
+        try:
+            return collector.collect(node_name, cluster_name, snapshot=snapshot,
+                                     timestamp=timestamp)
+        except Exception as e:
+            # Log error but continue with other collectors
+            logger.error("Error collecting %s for %s: %s", collector.name, node_name, e)
+            return None
 
 
 def create_default_registry(host: str = "localhost", port: int = 8123, debug: bool = False) -> MetricRegistry:
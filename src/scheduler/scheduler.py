@@ -7,8 +7,10 @@ and alert evaluation.
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 import logging
 
 from src.cluster import ClusterInfoProvider
@@ -26,12 +28,14 @@ class CollectionScheduler:
                  metric_registry: MetricRegistry,
                  metric_storage: MetricStorage,
                  alert_manager: AlertManager,
-                 interval_seconds: int = 60):
+                 interval_seconds: int = 60,
+                 max_workers: int = 16):
         self.cluster_provider = cluster_provider
         self.metric_registry = metric_registry
         self.metric_storage = metric_storage
         self.alert_manager = alert_manager
         self.interval_seconds = interval_seconds
+        self.max_workers = max_workers
 
         self._scheduler = BackgroundScheduler()
         self._running = False
@@ -68,6 +72,8 @@ class CollectionScheduler:
 
         self._scheduler.shutdown(wait=False)
         self._running = False
+        # Deliver alerts still held for coalescing
+        self.alert_manager.flush_pending()
         logger.info("Collection scheduler stopped")
 
     def is_running(self) -> bool:
@@ -79,43 +85,50 @@ class CollectionScheduler:
         self._collection_cycle()
 
     def _collection_cycle(self) -> None:
-        """Execute a single collection cycle for all nodes."""
+        """
+        Execute a single collection cycle for all nodes.
+
+        Nodes of all clusters are collected concurrently on a thread pool
+        and stored on the calling thread as each node completes. Alerts are
+        then evaluated once per (cluster, metric) over all of its nodes'
+        samples, so the alert manager is never used concurrently.
+        """
         logger.info("Starting metric collection cycle")
 
         clusters = self.cluster_provider.get_clusters()
+        targets = [(cluster.name, node.name) for cluster in clusters for node in cluster.nodes]
         total_metrics = 0
         total_alerts = 0
-
-        for cluster in clusters:
-            for node in cluster.nodes:
-                try:
-                    # Collect metrics for this node
-                    metrics = self.metric_registry.collect_all(
-                        node_name=node.name,
-                        cluster_name=cluster.name
-                    )
-
-                    # Store metrics
-                    self.metric_storage.store_batch(metrics)
-                    total_metrics += len(metrics)
-
-                    # Evaluate alerts for each metric
-                    for metric in metrics:
-                        try:
-                            value = float(metric.value)
-                            alerts = self.alert_manager.evaluate_metric(
-                                metric_name=metric.metric_name,
-                                metric_value=value,
-                                node_name=node.name,
-                                cluster_name=cluster.name
-                            )
-                            total_alerts += len(alerts)
-                        except (ValueError, TypeError):
-                            # Skip non-numeric metrics for alert evaluation
-                            pass
-
-                except Exception as e:
-                    logger.error(f"Failed to collect metrics for {cluster.name}/{node.name}: {e}")
+        # (cluster, metric) -> (values, node names), aligned
+        samples: Dict[Tuple[str, str], Tuple[List[float], List[str]]] = defaultdict(lambda: ([], []))
+
+        if targets:
+            workers = max(1, min(self.max_workers, len(targets)))
+            # One timestamp for the whole collection cycle
+            timestamp = datetime.utcnow().isoformat()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self.metric_registry.collect_all,
+                                    node_name=node_name,
+                                    cluster_name=cluster_name,
+                                    timestamp=timestamp): (cluster_name, node_name)
+                    for cluster_name, node_name in targets
+                }
+                for future in as_completed(futures):
+                    cluster_name, node_name = futures[future]
+                    try:
+                        metrics = future.result()
+
+                        # Store metrics
+                        self.metric_storage.store_batch(metrics)
+                        total_metrics += len(metrics)
+
+                        self._add_samples(samples, metrics, cluster_name, node_name)
+
+                    except Exception as e:
+                        logger.error("Failed to collect metrics for %s/%s: %s", cluster_name, node_name, e)
+
+        total_alerts = self._evaluate_alerts(samples)
 
         logger.info(f"Collection cycle completed: {total_metrics} metrics, {total_alerts} alerts")
 
@@ -125,3 +138,32 @@ class CollectionScheduler:
                 callback()
             except Exception as e:
                 logger.error(f"Callback execution failed: {e}")
+
+    @staticmethod
+    def _add_samples(samples, metrics, cluster_name: str, node_name: str) -> None:
+        """Add a node's numeric metric values to the cycle's alert samples."""
+        for metric in metrics:
+            try:
+                value = float(metric.value)
+            except (ValueError, TypeError):
+                # Skip non-numeric metrics for alert evaluation
+                continue
+            values, node_names = samples[(cluster_name, metric.metric_name)]
+            values.append(value)
+            node_names.append(node_name)
+
+    def _evaluate_alerts(self, samples) -> int:
+        """Evaluate each (cluster, metric) batch of samples. Returns the number of alerts raised."""
+        total_alerts = 0
+        for (cluster_name, metric_name), (values, node_names) in samples.items():
+            try:
+                alerts = self.alert_manager.evaluate_metric_batch(
+                    metric_name=metric_name,
+                    values=values,
+                    node_names=node_names,
+                    cluster_name=cluster_name
+                )
+                total_alerts += len(alerts)
+            except Exception as e:
+                logger.error("Failed to evaluate alerts for %s/%s: %s", cluster_name, metric_name, e)
+        return total_alerts
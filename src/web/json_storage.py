@@ -9,12 +9,41 @@ Directory structure: <base_dir>/<cluster>/<year>/<month>/<day>/ServceLogs_<times
 import os
 import json
 import glob
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
+# Prefer orjson for JSON parsing when available (both accept bytes)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-@dataclass
+# Metric log file extensions written by JsonMetricStorage (see SERIALIZERS)
+LOG_EXTENSIONS = ('.json', '.ndjson', '.cbor')
+
+
+def _glob_log_files(pattern: str, recursive: bool = False) -> List[str]:
+    """Glob ServceLogs_* files of any supported format."""
+    return [path for path in glob.glob(pattern, recursive=recursive)
+            if os.path.splitext(path)[1] in LOG_EXTENSIONS]
+
+
+def _decode_log_file(file_path: str, data: bytes) -> List[Dict[str, Any]]:
+    """Decode a metric log file according to its extension."""
+    ext = os.path.splitext(file_path)[1]
+    if ext == '.ndjson':
+        return [_json_loads(line) for line in data.splitlines() if line.strip()]
+    if ext == '.cbor':
+        import cbor2
+        return cbor2.loads(data)
+    return _json_loads(data)
+
+
+@dataclass(slots=True)
 class NodeStatus:
     """Represents the status of a node."""
     name: str
@@ -35,7 +64,7 @@ class NodeStatus:
         return "green" if self.status == 1 else "red"
 
 
-@dataclass 
+@dataclass(slots=True)
 class ClusterStatus:
     """Represents the aggregated status of a cluster."""
     name: str
@@ -79,6 +108,9 @@ class JsonMetricReader:
     JSON format: [{"clustername": "", "machinename": "", "metricname": "", "metricvalue": 0/1, "logtime": ""}]
     """
     
+    # Maximum number of parsed files kept in memory
+    FILE_CACHE_SIZE = 2048
+
     def __init__(self, base_dir: str):
         """
         Initialize the JSON metric reader.
@@ -87,6 +119,9 @@ class JsonMetricReader:
             base_dir: Base directory containing metric logs
         """
         self.base_dir = base_dir
+        # file path -> ((mtime_ns, size), parsed records), least recently used first
+        self._file_cache: "OrderedDict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def list_clusters(self) -> List[str]:
         """List all cluster names in the base directory."""
@@ -138,12 +173,12 @@ class JsonMetricReader:
             
             day_dir = os.path.join(cluster_dir, year, month, day)
             if os.path.exists(day_dir):
-                pattern = os.path.join(day_dir, "ServceLogs_*.json")
-                for file_path in glob.glob(pattern):
+                pattern = os.path.join(day_dir, "ServceLogs_*")
+                for file_path in _glob_log_files(pattern):
                     # Extract timestamp from filename
-                    filename = os.path.basename(file_path)
+                    filename = os.path.splitext(os.path.basename(file_path))[0]
                     try:
-                        timestamp_str = filename.replace("ServceLogs_", "").replace(".json", "")
+                        timestamp_str = filename.replace("ServceLogs_", "")
                         file_time = datetime.strptime(timestamp_str, "%Y%m%d%H%M")
                         if start_time <= file_time <= end_time:
                             json_files.append((file_time, file_path))
@@ -157,13 +192,40 @@ class JsonMetricReader:
         return [f[1] for f in json_files]
     
     def _read_json_file(self, file_path: str) -> List[Dict[str, Any]]:
-        """Read and parse a JSON metric file."""
+        """
+        Read and parse a JSON metric file.
+
+        Parsed files are cached and reused until the file's mtime or size
+        changes, so repeated dashboard requests do not re-read and re-parse
+        the same files. The returned list is shared and must not be modified.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError as e:
+            print(f"Error reading {file_path}: {e}")
+            return []
+        key = (st.st_mtime_ns, st.st_size)
+
+        with self._cache_lock:
+            cached = self._file_cache.get(file_path)
+            if cached is not None and cached[0] == key:
+                self._file_cache.move_to_end(file_path)
+                return cached[1]
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (IOError, json.JSONDecodeError) as e:
+            # One binary read; the parser decodes the UTF-8 bytes itself
+            with open(file_path, 'rb') as f:
+                data = _decode_log_file(file_path, f.read())
+        except (IOError, ValueError, ImportError) as e:
             print(f"Error reading {file_path}: {e}")
             return []
+
+        with self._cache_lock:
+            self._file_cache[file_path] = (key, data)
+            self._file_cache.move_to_end(file_path)
+            while len(self._file_cache) > self.FILE_CACHE_SIZE:
+                self._file_cache.popitem(last=False)
+        return data
     
     def _find_latest_json_file(self, cluster_name: str) -> Optional[str]:
         """
@@ -181,8 +243,8 @@ class JsonMetricReader:
             return None
         
         # Find all JSON files and sort by name (which includes timestamp)
-        pattern = os.path.join(cluster_dir, "**", "ServceLogs_*.json")
-        json_files = glob.glob(pattern, recursive=True)
+        pattern = os.path.join(cluster_dir, "**", "ServceLogs_*")
+        json_files = _glob_log_files(pattern, recursive=True)
         
         if not json_files:
             return None
@@ -199,8 +261,13 @@ class JsonMetricReader:
             cluster_name: Name of the cluster
         
         Returns:
-            List of metric records from the most recent JSON file
+            List of metric records from the most recent JSON file. The list
+            and its records are copies the caller may modify.
         """
+        return [dict(m) for m in self._latest_metrics(cluster_name)]
+    
+    def _latest_metrics(self, cluster_name: str) -> List[Dict[str, Any]]:
+        """Latest metric records for a cluster, shared with the file cache."""
         # First try to find files within the default time window (24 hours)
         json_files = self._find_json_files(cluster_name)
         
@@ -224,7 +291,7 @@ class JsonMetricReader:
         Returns:
             ClusterStatus object or None if no data
         """
-        metrics = self.get_latest_metrics(cluster_name)
+        metrics = self._latest_metrics(cluster_name)
         if not metrics:
             return None
         
@@ -295,8 +362,8 @@ class JsonMetricReader:
         if not os.path.exists(cluster_dir):
             return []
         
-        pattern = os.path.join(cluster_dir, "**", "ServceLogs_*.json")
-        json_files = glob.glob(pattern, recursive=True)
+        pattern = os.path.join(cluster_dir, "**", "ServceLogs_*")
+        json_files = _glob_log_files(pattern, recursive=True)
         
         # Sort by filename (which includes timestamp)
         json_files.sort()
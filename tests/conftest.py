@@ -1,4 +1,12 @@
 # pytest configuration and fixtures for HealthMonitor tests
 import pytest
 
-# Add common fixtures here if needed
+from src.cluster.provider import ClusterProviderFactory
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cluster_providers():
+    """Keep providers shared by ClusterProviderFactory from leaking between tests."""
+    ClusterProviderFactory.invalidate()
+    yield
+    ClusterProviderFactory.invalidate()
@@ -26,3 +26,373 @@ def test_alert_manager_add_and_evaluate_rule():
     assert alert.metric_name == "cpu_percent"
     assert alert.current_value == 90
     assert alert.severity == "critical"
+
+
+def test_alert_manager_indexes_rules_by_metric():
+    manager = AlertManager()
+    cpu = AlertRule(name="cpu", metric="cpu_percent", operator=">",
+                    threshold=80, severity="warning", cooldown_seconds=0)
+    mem = AlertRule(name="mem", metric="memory_percent", operator=">",
+                    threshold=80, severity="warning", cooldown_seconds=0)
+    manager.add_rule(cpu)
+    manager.add_rule(mem)
+
+    alerts = manager.evaluate_metric("cpu_percent", 90, "n1", "c1")
+    assert [a.rule_name for a in alerts] == ["cpu"]
+
+    # Re-adding a rule under the same name moves it to the new metric.
+    manager.add_rule(AlertRule(name="cpu", metric="disk_percent", operator=">",
+                               threshold=80, severity="warning", cooldown_seconds=0))
+    assert manager.evaluate_metric("cpu_percent", 90, "n1", "c1") == []
+    assert len(manager.evaluate_metric("disk_percent", 90, "n1", "c1")) == 1
+
+    manager.remove_rule("mem")
+    assert manager.evaluate_metric("memory_percent", 90, "n1", "c1") == []
+    assert [r.name for r in manager.get_all_rules()] == ["cpu"]
+
+
+@pytest.mark.parametrize("op,value,expected", [
+    (">", 81, True), (">", 80, False),
+    ("<", 79, True), ("<", 80, False),
+    (">=", 80, True), ("<=", 80, True),
+    ("==", 80, True), ("!=", 80, False),
+    ("~", 80, False),
+])
+def test_alert_rule_evaluate_operators(op, value, expected):
+    rule = AlertRule(name="r", metric="m", operator=op, threshold=80, severity="info")
+    assert rule.evaluate(value) is expected
+
+
+def test_evaluate_metric_batch_matches_per_sample_evaluation():
+    def make_manager():
+        manager = AlertManager()
+        manager.add_rule(AlertRule(name="hot", metric="cpu_percent", operator=">",
+                                   threshold=80, severity="warning", cooldown_seconds=0))
+        manager.add_rule(AlertRule(name="idle", metric="cpu_percent", operator="<",
+                                   threshold=5, severity="info", cooldown_seconds=0))
+        return manager
+
+    values = [90.0, 50.0, 1.0, 95.0]
+    nodes = ["n1", "n2", "n3", "n4"]
+
+    batch = make_manager().evaluate_metric_batch("cpu_percent", values, nodes, "c1")
+
+    single = make_manager()
+    expected = []
+    for value, node in zip(values, nodes):
+        expected.extend(single.evaluate_metric("cpu_percent", value, node, "c1"))
+
+    key = lambda a: (a.rule_name, a.node_name, a.current_value)
+    assert sorted(map(key, batch)) == sorted(map(key, expected))
+    assert [a.node_name for a in batch] == ["n1", "n4", "n3"]
+
+
+def test_evaluate_metric_batch_rejects_misaligned_input():
+    with pytest.raises(ValueError):
+        AlertManager().evaluate_metric_batch("cpu_percent", [1.0], [], "c1")
+
+
+def test_alert_history_is_bounded():
+    manager = AlertManager(history_size=3)
+    manager.add_rule(AlertRule(name="hot", metric="cpu_percent", operator=">",
+                               threshold=80, severity="warning", cooldown_seconds=0))
+    for i in range(5):
+        manager.evaluate_metric("cpu_percent", 90, f"n{i}", "c1")
+
+    assert [a.node_name for a in manager.get_alert_history()] == ["n2", "n3", "n4"]
+    assert [a.node_name for a in manager.get_alert_history(limit=2)] == ["n3", "n4"]
+
+
+def _make_alert(i=0):
+    from src.alerts.manager import AlertEvent
+    return AlertEvent(
+        alert_id=f"a{i}", rule_name="r", metric_name="m", node_name=f"n{i}",
+        cluster_name="c", current_value=i, threshold=0, operator=">",
+        severity="info", timestamp="2024-01-01T00:00:00", message="msg",
+    )
+
+
+def test_webhook_action_batches_alerts(monkeypatch):
+    import json
+    import requests
+    from unittest.mock import MagicMock
+    from src.alerts.manager import WebhookAlertAction
+
+    post = MagicMock(return_value=MagicMock(status_code=200))
+    monkeypatch.setattr(requests.Session, "post", post)
+
+    single = WebhookAlertAction("http://hook")
+    assert single.execute(_make_alert()) is True
+    assert json.loads(post.call_args.kwargs["data"])["alert_id"] == "a0"
+    assert post.call_args.kwargs["headers"]["Content-Type"] == "application/json"
+
+    post.reset_mock()
+    action = WebhookAlertAction("http://hook", batch_size=2, flush_interval=5)
+    for i in range(3):
+        assert action.execute(_make_alert(i)) is True
+    action.close(timeout=5)
+
+    batches = [json.loads(call.kwargs["data"]) for call in post.call_args_list]
+    assert [[p["alert_id"] for p in b] for b in batches] == [["a0", "a1"], ["a2"]]
+
+
+def test_webhook_action_only_posts_arrays_with_batch_size(monkeypatch):
+    import json
+    import requests
+    from unittest.mock import MagicMock
+    from src.alerts.manager import WebhookAlertAction
+
+    post = MagicMock(return_value=MagicMock(status_code=200))
+    monkeypatch.setattr(requests.Session, "post", post)
+    alerts = [_make_alert(i) for i in range(3)]
+
+    assert WebhookAlertAction("http://hook").batch_execute(alerts) is True
+    bodies = [json.loads(call.kwargs["data"]) for call in post.call_args_list]
+    assert [body["alert_id"] for body in bodies] == ["a0", "a1", "a2"]
+
+    post.reset_mock()
+    assert WebhookAlertAction("http://hook", batch_size=2).batch_execute(alerts) is True
+    bodies = [json.loads(call.kwargs["data"]) for call in post.call_args_list]
+    assert [[p["alert_id"] for p in body] for body in bodies] == [["a0", "a1"], ["a2"]]
+
+def test_webhook_action_sends_queued_alerts_at_exit(monkeypatch):
+    import json
+    import requests
+    from unittest.mock import MagicMock
+    from src.alerts import manager as manager_module
+    from src.alerts.manager import WebhookAlertAction
+
+    post = MagicMock(return_value=MagicMock(status_code=200))
+    monkeypatch.setattr(requests.Session, "post", post)
+
+    action = WebhookAlertAction("http://hook", batch_size=10, flush_interval=60)
+    action.execute(_make_alert(7))
+    assert action in manager_module._OPEN_ACTIONS
+
+    manager_module._close_open_actions()
+    assert [p["alert_id"] for p in json.loads(post.call_args.kwargs["data"])] == ["a7"]
+    assert action not in manager_module._OPEN_ACTIONS
+
+
+def test_file_action_buffers_until_flush(tmp_path):
+    import json
+    from src.alerts.manager import FileAlertAction
+
+    path = tmp_path / "alerts" / "alerts.log"
+    action = FileAlertAction(str(path), flush_interval=60)
+    assert action.execute(_make_alert(0)) is True
+    assert action.execute(_make_alert(1)) is True
+    assert path.read_text() == ""
+
+    action.flush()
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["alert_id"] for line in lines] == ["a0", "a1"]
+
+    action.execute(_make_alert(2))
+    action.close()
+    assert len(path.read_text().splitlines()) == 3
+
+
+def test_file_action_is_released_after_close(tmp_path):
+    import gc
+    import weakref
+    from src.alerts import manager as manager_module
+    from src.alerts.manager import FileAlertAction
+
+    path = tmp_path / "alerts.log"
+    action = FileAlertAction(str(path), flush_interval=60)
+    action.execute(_make_alert(0))
+    assert action in manager_module._OPEN_ACTIONS
+
+    manager_module._close_open_actions()
+    assert len(path.read_text().splitlines()) == 1
+    assert action not in manager_module._OPEN_ACTIONS
+
+    ref = weakref.ref(action)
+    del action
+    gc.collect()
+    assert ref() is None
+
+
+def test_alert_event_payload_is_built_once():
+    import json
+    alert = _make_alert(3)
+    assert alert.as_dict is alert.as_dict
+    assert json.loads(alert.as_json) == alert.as_dict
+    assert alert.as_dict["node_name"] == "n3"
+    assert "operator" not in alert.as_dict
+
+
+def test_log_action_message(caplog):
+    import logging
+    action = LogAlertAction(level="error")
+    with caplog.at_level(logging.ERROR, logger="src.alerts.manager"):
+        assert action.execute(_make_alert(7)) is True
+    assert caplog.messages == ["ALERT [INFO] r: m = 7 > 0 on c/n7"]
+
+
+def test_alert_rule_cooldown_uses_monotonic_clock(monkeypatch):
+    import src.alerts.manager as manager_module
+    clock = [1000.0]
+    monkeypatch.setattr(manager_module.time, "monotonic", lambda: clock[0])
+
+    rule = AlertRule(name="r", metric="m", operator=">", threshold=0,
+                     severity="info", cooldown_seconds=60)
+    assert rule.should_trigger("c/n")
+    rule.mark_triggered("c/n")
+    clock[0] += 59
+    assert not rule.should_trigger("c/n")
+    clock[0] += 1
+    assert rule.should_trigger("c/n")
+
+
+def test_load_rules_from_file(tmp_path):
+    config = tmp_path / "alerts.yaml"
+    config.write_text(
+        "rules:\n"
+        "  - name: high_cpu\n"
+        "    metric: cpu_percent\n"
+        "    operator: '>'\n"
+        "    threshold: 90\n"
+        "    actions:\n"
+        "      - type: log\n"
+        "        params: {level: error}\n",
+        encoding="utf-8",
+    )
+    manager = AlertManager()
+    manager.load_rules_from_file(str(config))
+    rule = manager.get_rule("high_cpu")
+    assert rule is not None
+    assert rule.threshold == 90
+    assert rule.severity == "warning"
+    assert isinstance(rule.actions[0], LogAlertAction)
+
+
+def test_rule_changes_during_evaluation_do_not_affect_current_pass():
+    from src.alerts.manager import CustomAlertAction
+    manager = AlertManager()
+
+    def remove_second(alert):
+        manager.remove_rule("second")
+        return True
+
+    manager.add_rule(AlertRule(name="first", metric="m", operator=">", threshold=0,
+                               severity="info", cooldown_seconds=0,
+                               actions=[CustomAlertAction(remove_second)]))
+    manager.add_rule(AlertRule(name="second", metric="m", operator=">", threshold=0,
+                               severity="info", cooldown_seconds=0))
+
+    alerts = manager.evaluate_metric("m", 1, "n", "c")
+    assert [a.rule_name for a in alerts] == ["first", "second"]
+    assert [a.rule_name for a in manager.evaluate_metric("m", 1, "n", "c")] == ["first"]
+
+
+def test_multiple_actions_run_concurrently():
+    import threading
+    from src.alerts.manager import CustomAlertAction
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_peer(alert):
+        barrier.wait()
+        return True
+
+    def fail(alert):
+        raise RuntimeError("boom")
+
+    manager = AlertManager()
+    manager.add_rule(AlertRule(
+        name="r", metric="m", operator=">", threshold=0, severity="info",
+        cooldown_seconds=0,
+        actions=[CustomAlertAction(wait_for_peer), CustomAlertAction(wait_for_peer),
+                 CustomAlertAction(fail)],
+    ))
+    # Serial execution would deadlock on the barrier and raise BrokenBarrierError.
+    alerts = manager.evaluate_metric("m", 1, "n", "c")
+    assert len(alerts) == 1
+    assert not barrier.broken
+
+
+def test_coalesced_alerts_are_delivered_once_per_rule():
+    from src.alerts.manager import AlertAction
+
+    class Recorder(AlertAction):
+        def __init__(self):
+            self.batches = []
+
+        def execute(self, alert):
+            self.batches.append([alert.node_name])
+            return True
+
+        def batch_execute(self, alerts):
+            self.batches.append([a.node_name for a in alerts])
+            return True
+
+    recorder = Recorder()
+    manager = AlertManager(coalesce_window=60)
+    manager.add_rule(AlertRule(name="hot", metric="cpu_percent", operator=">",
+                               threshold=80, severity="warning", cooldown_seconds=0,
+                               actions=[recorder]))
+
+    alerts = manager.evaluate_metric_batch("cpu_percent", [90, 95, 10], ["n1", "n2", "n3"], "c1")
+    assert len(alerts) == 2
+    assert recorder.batches == []
+
+    manager.flush_pending()
+    assert recorder.batches == [["n1", "n2"]]
+    manager.flush_pending()
+    assert recorder.batches == [["n1", "n2"]]
+
+
+def test_alert_ids_are_unique():
+    manager = AlertManager()
+    manager.add_rule(AlertRule(name="r", metric="m", operator=">", threshold=0,
+                               severity="info", cooldown_seconds=0))
+    ids = [manager.evaluate_metric("m", 1, "n", "c")[0].alert_id for _ in range(50)]
+    assert len(set(ids)) == 50
+    assert all(i.startswith("r-c/n-") for i in ids)
+
+
+def test_cooldown_is_tracked_per_node():
+    manager = AlertManager()
+    manager.add_rule(AlertRule(name="r", metric="m", operator=">", threshold=0,
+                               severity="info", cooldown_seconds=300))
+    assert len(manager.evaluate_metric("m", 1, "n1", "c")) == 1
+    assert manager.evaluate_metric("m", 1, "n1", "c") == []
+    assert len(manager.evaluate_metric("m", 1, "n2", "c")) == 1
+    assert manager.evaluate_metric_batch("m", [1, 1], ["n1", "n2"], "c") == []
+
+
+def test_alert_json_is_compact_utf8():
+    alert = _make_alert(0)
+    alert.message = "température élevée"
+    assert b", " not in alert.as_json and b'": ' not in alert.as_json
+    assert "température élevée".encode("utf-8") in alert.as_json
+
+
+def test_alert_event_has_no_instance_dict():
+    alert = _make_alert(0)
+    assert not hasattr(alert, "__dict__")
+    assert alert.as_dict is alert.as_dict
+
+
+def test_burn_rate_gate_requires_sustained_trips(monkeypatch):
+    import src.alerts.manager as manager_module
+    clock = [1000.0]
+    monkeypatch.setattr(manager_module.time, "monotonic", lambda: clock[0])
+
+    # At least one trip every 10s over both the last 10s and the last 60s.
+    rule = AlertRule(name="r", metric="m", operator=">", threshold=0, severity="info",
+                     cooldown_seconds=0, short_window_s=10, long_window_s=60,
+                     burn_threshold=0.1)
+    fired = []
+    for _ in range(12):
+        fired.append(rule.should_trigger("c/n"))
+        clock[0] += 1
+    # One trip already meets the short-window rate; the long window needs six.
+    assert fired[:5] == [False] * 5
+    assert all(fired[5:])
+
+    # After a quiet spell the short window empties and the gate closes again.
+    clock[0] += 120
+    assert rule.should_trigger("c/n") is False
@@ -1,5 +1,7 @@
 import pytest
+import logging
 import os
+from unittest.mock import patch
 from src.cluster.provider import (
     FileClusterProvider,
     PowerShellClusterProvider,
@@ -38,6 +40,148 @@ class TestFileClusterProvider:
         cluster = provider.get_cluster("nonexistent-cluster-xyz")
         assert cluster is None
 
+    def test_make_node_interns_strings_and_copies_attributes(self):
+        from src.cluster.provider import _make_node
+
+        attributes = {"environment": "".join(["pro", "d"]), "tags": ["a"]}
+        first = _make_node("n1", "".join(["work", "er"]), "h1", "local", attributes)
+        second = _make_node("n2", "".join(["work", "er"]), "h2", "local", attributes)
+
+        assert first.type is second.type
+        assert first.attributes["environment"] is second.attributes["environment"]
+        assert first.attributes is not second.attributes
+        assert first.attributes is not attributes
+        first.attributes["tags"].append("b")
+        assert second.attributes["tags"] == ["a"]
+        assert attributes["tags"] == ["a"]
+
+
+    def test_loads_clusters_from_json(self, tmp_path):
+        config_file = tmp_path / "clusters.json"
+        config_file.write_text(
+            '{"clusters": [{"name": "json-cluster", "nodes": '
+            '[{"name": "json-node-01", "host": "10.0.0.1"}]}]}',
+            encoding='utf-8'
+        )
+        provider = FileClusterProvider(str(config_file))
+        cluster = provider.get_cluster("json-cluster")
+        assert cluster is not None
+        assert [n.name for n in cluster.nodes] == ["json-node-01"]
+        assert cluster.nodes[0].type == "worker"
+
+    def test_loads_non_ascii_yaml(self, tmp_path):
+        config_file = tmp_path / "clusters.yaml"
+        config_file.write_text(
+            "clusters:\n"
+            "  - name: yaml-cluster\n"
+            "    description: \"Cluster für Tests\"\n"
+            "    nodes:\n"
+            "      - name: yaml-node-01\n",
+            encoding='utf-8'
+        )
+        provider = FileClusterProvider(str(config_file))
+        cluster = provider.get_cluster("yaml-cluster")
+        assert cluster is not None
+        assert cluster.description == "Cluster für Tests"
+        assert [n.name for n in cluster.nodes] == ["yaml-node-01"]
+
+
+    def test_refresh_skips_unchanged_file(self, tmp_path):
+        config_file = tmp_path / "clusters.json"
+        config_file.write_text('{"clusters": [{"name": "a", "nodes": []}]}', encoding='utf-8')
+        provider = FileClusterProvider(str(config_file))
+        clusters = provider.get_clusters()
+
+        provider.refresh()
+        assert provider.get_clusters() is clusters
+
+        config_file.write_text('{"clusters": [{"name": "b", "nodes": []}, {"name": "c"}]}',
+                               encoding='utf-8')
+        provider.refresh()
+        assert [c.name for c in provider.get_clusters()] == ["b", "c"]
+
+        config_file.unlink()
+        provider.refresh()
+        assert provider.get_clusters() == []
+
+    def test_recovers_after_failed_initial_load(self, tmp_path):
+        config_file = tmp_path / "clusters.yaml"
+        config_file.write_text("clusters: [unclosed", encoding='utf-8')
+        provider = FileClusterProvider(str(config_file))
+        for _ in range(2):
+            with pytest.raises(Exception):
+                provider.get_clusters()
+
+        config_file.write_text("clusters:\n  - name: fixed\n    nodes: []\n", encoding='utf-8')
+        provider.refresh()
+        assert [c.name for c in provider.get_clusters()] == ["fixed"]
+
+    def test_failed_initial_load_is_retried(self, tmp_path):
+        config_file = tmp_path / "clusters.yaml"
+        config_file.write_text("clusters: [unclosed", encoding='utf-8')
+        provider = FileClusterProvider(str(config_file))
+        with pytest.raises(Exception):
+            provider.get_clusters()
+
+        config_file.write_text("clusters:\n  - name: fixed\n", encoding='utf-8')
+        assert provider.get_cluster("fixed") is not None
+
+    def test_factory_shares_provider_for_same_config(self):
+        from src.cluster.provider import ClusterProviderFactory
+
+        config = {'file_path': TEST_CLUSTERS_YAML}
+        provider = ClusterProviderFactory.create('file', config)
+        assert ClusterProviderFactory.create('file', dict(config)) is provider
+        assert ClusterProviderFactory.create('file', {'file_path': 'other.yaml'}) is not provider
+
+        ClusterProviderFactory.invalidate()
+        assert ClusterProviderFactory.create('file', config) is not provider
+
+
+class TestCluster:
+    """Tests for Cluster node lookup."""
+
+    def test_get_node_by_name(self):
+        nodes = [Node("a", "worker", "h1", "local"), Node("b", "worker", "h2", "local")]
+        cluster = Cluster(name="c", description="", nodes=nodes)
+        assert cluster.get_node("b") is nodes[1]
+        assert cluster.get_node("missing") is None
+
+    def test_get_node_sees_replaced_nodes(self):
+        cluster = Cluster(name="c", description="", nodes=[Node("a", "worker", "h1", "local")])
+        assert cluster.get_node("a") is not None
+        cluster.nodes = [Node("b", "worker", "h2", "local")]
+        assert cluster.get_node("a") is None
+        assert cluster.get_node("b") is not None
+
+    def test_get_node_sees_in_place_edits(self):
+        cluster = Cluster(name="c", description="", nodes=[Node("a", "worker", "h1", "local")])
+        assert cluster.get_node("a") is not None
+        cluster.nodes[0] = Node("b", "worker", "h2", "local")
+        assert cluster.get_node("b") is cluster.nodes[0]
+        cluster.nodes[0].name = "renamed"
+        assert cluster.get_node("b") is None
+        assert cluster.get_node("renamed") is cluster.nodes[0]
+
+    def test_index_is_not_part_of_the_dataclass(self):
+        from dataclasses import asdict
+        nodes = [Node("a", "worker", "h1", "local")]
+        indexed = Cluster(name="c", description="", nodes=list(nodes))
+        indexed.get_node("a")
+        plain = Cluster(name="c", description="", nodes=list(nodes))
+        assert indexed == plain
+        assert asdict(indexed) == asdict(plain)
+        assert set(asdict(indexed)) == {"name", "description", "nodes"}
+
+    def test_get_node_misses_node_replaced_in_place(self):
+        nodes = [Node("a", "worker", "h1", "local"), Node("b", "worker", "h2", "local")]
+        cluster = Cluster(name="c", description="", nodes=nodes)
+        assert cluster.get_node("a") is nodes[0]
+        cluster.nodes[0] = Node("z", "worker", "h3", "local")
+        assert cluster.get_node("a") is None
+        assert cluster.get_node("z") is cluster.nodes[0]
+        assert cluster.get_node("b") is nodes[1]
+
 
 class TestPowerShellClusterProvider:
     """Tests for PowerShellClusterProvider CSV parsing."""
@@ -89,6 +233,30 @@ MACHINE1,POD1,CH,0,Image,SKU,10.0.0.1,100,CH,100,H,None,0,0,1900-01-01,,,Cluster
         assert len(nodes) == 1
         assert nodes[0].name == "MACHINE1"
 
+    def test_parse_machine_info_csv_handles_quoted_fields(self):
+        """Test that quoted fields containing commas do not shift columns."""
+        csv_content = (
+            'NODE001,"POD1,A",CH,0,Image,SKU,10.0.0.1,100,CH,100,H,None,0,0,1900-01-01,,,Cluster1,NODE001\r\n'
+            '\r\n'
+        )
+
+        nodes = PowerShellClusterProvider.parse_machine_info_csv(csv_content)
+
+        assert len(nodes) == 1
+        assert nodes[0].host == "10.0.0.1"
+        assert nodes[0].attributes["environment"] == "Cluster1"
+
+    def test_parse_machine_info_csv_accepts_bytes(self):
+        """Test that raw process output bytes parse the same as text."""
+        with open(TEST_MACHINEINFO_CSV, 'rb') as f:
+            raw = f.read()
+
+        from_bytes = PowerShellClusterProvider.parse_machine_info_csv(raw)
+        from_text = PowerShellClusterProvider.parse_machine_info_csv(raw.decode('utf-8'))
+
+        assert from_bytes == from_text
+        assert len(from_bytes) == 39
+
     def test_parse_machine_info_csv_handles_empty_content(self):
         """Test handling of empty CSV content."""
         nodes = PowerShellClusterProvider.parse_machine_info_csv("")
@@ -135,6 +303,27 @@ PENDING_NODE,POD1,CH,0,Image,SKU,10.0.0.2,100,CH,100,P,None,0,0,1900-01-01,,,Clu
         assert nodes[0].attributes["status"] == "H"
         assert nodes[1].attributes["status"] == "P"
 
+    def test_parse_machine_info_csv_shares_repeated_values(self):
+        """Test that repeated column values are shared string objects."""
+        with open(TEST_MACHINEINFO_CSV, 'r', encoding='utf-8') as f:
+            nodes = PowerShellClusterProvider.parse_machine_info_csv(f.read())
+
+        assert len({id(n.type) for n in nodes}) == len({n.type for n in nodes})
+        environments = [n.attributes["environment"] for n in nodes]
+        assert len({id(e) for e in environments}) == len(set(environments))
+
+    def test_parse_machine_info_csv_returns_independent_nodes(self):
+        """Test that nodes from separate parses can be modified independently."""
+        with open(TEST_MACHINEINFO_CSV, 'r', encoding='utf-8') as f:
+            csv_content = f.read()
+
+        first = PowerShellClusterProvider.parse_machine_info_csv(csv_content)
+        second = PowerShellClusterProvider.parse_machine_info_csv(csv_content)
+
+        assert first[0] is not second[0]
+        first[0].attributes["environment"] = "modified"
+        assert second[0].attributes["environment"] != "modified"
+
     def test_parse_actual_machineinfo_file_node_count(self):
         """Test that actual machineinfo.csv has expected number of CH nodes (excluding UTILITY)."""
         with open(TEST_MACHINEINFO_CSV, 'r', encoding='utf-8') as f:
@@ -177,3 +366,180 @@ PENDING_NODE,POD1,CH,0,Image,SKU,10.0.0.2,100,CH,100,P,None,0,0,1900-01-01,,,Clu
         assert PowerShellClusterProvider._extract_region("SingleName") == "SingleName"
         assert PowerShellClusterProvider._extract_region("") == ""
         assert PowerShellClusterProvider._extract_region("A-B-C-D") == "D"
+
+    def test_refresh_uses_cached_nodes_within_ttl(self, tmp_path):
+        """Test that a fresh cache file is used instead of running dmclient.exe."""
+        with open(TEST_MACHINEINFO_CSV, 'r', encoding='utf-8') as f:
+            nodes = PowerShellClusterProvider.parse_machine_info_csv(f.read())
+
+        with patch('subprocess.run', side_effect=FileNotFoundError) as mock_run:
+            provider = PowerShellClusterProvider(
+                "MTTitanMetricsBE-Prod-MWHE01", cache_dir=str(tmp_path)
+            )
+            assert provider.get_clusters() == []
+            provider._save_cached_nodes(nodes)
+            mock_run.reset_mock()
+
+            provider.refresh()
+            mock_run.assert_not_called()
+            cluster = provider.get_cluster("MTTitanMetricsBE-Prod-MWHE01")
+            assert cluster is not None
+            assert cluster.nodes == nodes
+
+            provider.cache_ttl = 0
+            provider.refresh()
+            mock_run.assert_called_once()
+            assert provider.get_clusters() == []
+
+    def test_concurrent_cache_writes_use_separate_temp_files(self, tmp_path):
+        """Test that overlapping cache writes never share a temporary file."""
+        import threading
+
+        nodes = [Node("n1", "CH", "n1", "remote")]
+        providers = [
+            PowerShellClusterProvider("MTTitanMetricsBE-Prod-MWHE01", cache_dir=str(tmp_path))
+            for _ in range(4)
+        ]
+        threads = [threading.Thread(target=lambda p=p: [p._save_cached_nodes(nodes) for _ in range(20)])
+                   for p in providers]
+        with patch.object(logging.getLogger('src.cluster.provider'), 'warning') as warning:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        warning.assert_not_called()
+        assert os.listdir(tmp_path) == [os.path.basename(providers[0]._get_cache_path())]
+        assert providers[0]._load_cached_nodes() == nodes
+
+    def test_refresh_runs_powershell_without_profile(self, tmp_path):
+        """Test that PowerShell is launched non-interactively without profiles."""
+        with patch('subprocess.run', side_effect=FileNotFoundError) as mock_run:
+            PowerShellClusterProvider(
+                "MTTitanMetricsBE-Prod-MWHE01", cache_dir=str(tmp_path), cache_ttl=0,
+                use_powershell=True
+            ).get_clusters()
+
+        args = mock_run.call_args[0][0]
+        assert args[1:4] == ['-NoProfile', '-NonInteractive', '-Command']
+        assert "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8" in args[4]
+        assert "text" not in mock_run.call_args.kwargs
+        assert "GetMachineInfo -f CH -w MTTitanMetricsBE-Prod-MWHE01" in args[4]
+
+    def test_refresh_launches_dmclient_directly(self, tmp_path):
+        """Test that dmclient.exe runs without PowerShell from its own directory."""
+        dmclient_dir = str(tmp_path / "tools")
+        with patch('subprocess.run', side_effect=FileNotFoundError) as mock_run:
+            PowerShellClusterProvider(
+                "MTTitanMetricsBE-Prod-MWHE01", dmclient_path=dmclient_dir,
+                cache_dir=str(tmp_path), cache_ttl=0
+            ).get_clusters()
+
+        args = mock_run.call_args[0][0]
+        assert args == [os.path.join(dmclient_dir, 'dmclient.exe'), '-C', 'MWHE01',
+                        '-c', 'GetMachineInfo -f CH -w MTTitanMetricsBE-Prod-MWHE01']
+        assert mock_run.call_args.kwargs['cwd'] == dmclient_dir
+
+    def test_refresh_reuses_prebuilt_command(self, tmp_path):
+        """Test that the dmclient.exe argv is built once, not on every refresh."""
+        provider = PowerShellClusterProvider(
+            "MTTitanMetricsBE-Prod-MWHE01", dmclient_path=str(tmp_path),
+            cache_dir=str(tmp_path), cache_ttl=0
+        )
+        with patch('subprocess.run', side_effect=FileNotFoundError) as mock_run:
+            provider.refresh()
+            provider.refresh()
+
+        first, second = (call.args[0] for call in mock_run.call_args_list)
+        assert first is second is provider._args
+        assert first[-1] == "GetMachineInfo -f CH -w MTTitanMetricsBE-Prod-MWHE01"
+
+    def test_refresh_logs_instead_of_printing(self, tmp_path, capsys, caplog):
+        """Test that refresh diagnostics go through logging, not stdout."""
+        with patch('subprocess.run', side_effect=FileNotFoundError("dmclient.exe")):
+            provider = PowerShellClusterProvider(
+                "MTTitanMetricsBE-Prod-MWHE01", cache_dir=str(tmp_path), cache_ttl=0
+            )
+            provider.get_clusters()
+
+        assert capsys.readouterr().out == ""
+        assert any(r.levelname == "ERROR" and "Command not found" in r.getMessage()
+                   for r in caplog.records)
+
+    def test_initial_load_is_deferred_until_first_use(self, tmp_path):
+        """Test that constructing the provider does not launch PowerShell."""
+        with patch('subprocess.run', side_effect=FileNotFoundError) as mock_run:
+            provider = PowerShellClusterProvider(
+                "MTTitanMetricsBE-Prod-MWHE01", cache_dir=str(tmp_path), cache_ttl=0
+            )
+            mock_run.assert_not_called()
+
+            provider.refresh_async().result()
+            assert provider.get_clusters() == []
+            assert provider.get_cluster("MTTitanMetricsBE-Prod-MWHE01") is None
+            mock_run.assert_called_once()
+
+    def test_refresh_reuses_in_memory_result_within_ttl(self, tmp_path):
+        """Test that repeated refreshes skip both dmclient.exe and the cache file."""
+        with open(TEST_MACHINEINFO_CSV, 'rb') as f:
+            csv_content = f.read()
+        completed = type("Completed", (), {"returncode": 0, "stdout": csv_content, "stderr": b""})
+
+        with patch('subprocess.run', return_value=completed) as mock_run:
+            provider = PowerShellClusterProvider(
+                "MTTitanMetricsBE-Prod-MWHE01", cache_dir=str(tmp_path)
+            )
+            clusters = provider.get_clusters()
+            assert mock_run.call_count == 1
+            assert clusters
+
+            os.remove(provider._get_cache_path())
+            provider.refresh()
+            assert mock_run.call_count == 1
+            assert provider.get_clusters() is clusters
+
+            provider._cache_expiry = 0.0
+            provider.refresh()
+            assert mock_run.call_count == 2
+
+            provider.refresh()
+            assert mock_run.call_count == 2
+            provider.invalidate()
+            assert not os.path.exists(provider._get_cache_path())
+            provider.refresh()
+            assert mock_run.call_count == 3
+
+    def test_concurrent_refreshes_share_one_dmclient_run(self, tmp_path):
+        """Test that overlapping refresh() calls launch dmclient.exe only once."""
+        import threading
+        import time
+
+        with open(TEST_MACHINEINFO_CSV, 'rb') as f:
+            csv_content = f.read()
+        completed = type("Completed", (), {"returncode": 0, "stdout": csv_content, "stderr": b""})
+        started = threading.Event()
+        release = threading.Event()
+
+        def fake_run(*args, **kwargs):
+            started.set()
+            assert release.wait(5)
+            return completed
+
+        provider = PowerShellClusterProvider(
+            "MTTitanMetricsBE-Prod-MWHE01", cache_dir=str(tmp_path), cache_ttl=0
+        )
+        with patch('subprocess.run', side_effect=fake_run) as mock_run:
+            threads = [threading.Thread(target=provider.refresh) for _ in range(4)]
+            threads[0].start()
+            assert started.wait(5)
+            for thread in threads[1:]:
+                thread.start()
+            time.sleep(0.1)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+            assert mock_run.call_count == 1
+            assert provider._clusters
+
+            provider.refresh()
+            assert mock_run.call_count == 2
@@ -15,6 +15,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from collector_cli import (
     collect_metrics_for_node,
+    collect_cluster_metrics,
+    iter_cluster_metrics,
     create_provider,
     setup_logging,
 )
@@ -38,7 +40,7 @@ class TestClickHouseStatusCollector:
 
     def test_clickhouse_status_collector_healthy(self):
         """Test ClickHouseStatusCollector returns 1 when server responds Ok."""
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.text = "Ok."
@@ -54,7 +56,7 @@ class TestClickHouseStatusCollector:
 
     def test_clickhouse_status_collector_unhealthy(self):
         """Test ClickHouseStatusCollector returns 0 when server is down."""
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_get.side_effect = Exception("Connection refused")
             
             collector = ClickHouseStatusCollector(host="localhost", port=8123)
@@ -63,6 +65,26 @@ class TestClickHouseStatusCollector:
             assert metric.metric_name == "clickhouse_status"
             assert metric.value == 0
 
+    def test_clickhouse_status_collector_tcp_mode(self):
+        """Test tcp mode reports 1 when the port accepts connections, 0 otherwise."""
+        import socket
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(1)
+            port = server.getsockname()[1]
+
+            collector = ClickHouseStatusCollector(host="127.0.0.1", port=port, timeout=1, mode="tcp")
+            with patch('requests.Session.get') as mock_get:
+                assert collector.collect("test-node", "test-cluster").value == 1
+                mock_get.assert_not_called()
+
+        assert collector.collect("test-node", "test-cluster").value == 0
+
+    def test_clickhouse_status_collector_invalid_mode(self):
+        """Test an unknown probe mode is rejected."""
+        with pytest.raises(ValueError):
+            ClickHouseStatusCollector(mode="udp")
+
     def test_get_all_collectors(self):
         """Test get_all_collectors returns ClickHouseStatusCollector."""
         collectors = get_all_collectors(host="localhost", port=8123)
@@ -70,6 +92,8 @@ class TestClickHouseStatusCollector:
         assert len(collectors) == 1
         assert collectors[0].name == "clickhouse_status"
         assert isinstance(collectors[0], ClickHouseStatusCollector)
+        assert get_all_collectors(host="localhost", port=8123)[0] is collectors[0]
+        assert get_all_collectors(host="other-host", port=8123)[0] is not collectors[0]
 
 
 class TestFileClusterProvider:
@@ -118,7 +142,7 @@ class TestCollectMetricsForNode:
         logger = setup_logging(verbose=False)
         
         # Mock the ClickHouse request
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.text = "Ok."
@@ -141,7 +165,7 @@ class TestCollectMetricsForNode:
         logger = setup_logging(verbose=False)
         
         # Mock connection failure
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_get.side_effect = Exception("Connection refused")
             
             metrics = collect_metrics_for_node(node, cluster.name, 8123, logger)
@@ -151,6 +175,52 @@ class TestCollectMetricsForNode:
             assert metrics[0].value == 0
 
 
+class TestCollectClusterMetrics:
+    """Tests for collect_cluster_metrics function."""
+
+    def test_collect_cluster_metrics_preserves_node_order(self):
+        """Test that concurrent collection returns metrics in node order."""
+        nodes = [
+            Node(name=f"node-{i:02d}", type="worker", host=f"10.0.0.{i}",
+                 collection_method="remote")
+            for i in range(8)
+        ]
+        logger = setup_logging(verbose=False)
+
+        with patch('requests.Session.get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.text = "Ok."
+            mock_get.return_value = mock_response
+
+            metrics = collect_cluster_metrics(nodes, "test-cluster", 8123, logger, max_workers=4)
+
+        assert [m.node_name for m in metrics] == [n.name for n in nodes]
+        assert all(m.value == 1 for m in metrics)
+        assert len({m.timestamp for m in metrics}) == 1
+
+    def test_iter_cluster_metrics_yields_each_node_once(self):
+        """Test that streaming collection yields every node index exactly once."""
+        nodes = [
+            Node(name=f"node-{i:02d}", type="worker", host=f"10.0.0.{i}",
+                 collection_method="remote")
+            for i in range(5)
+        ]
+        logger = setup_logging(verbose=False)
+
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value = MagicMock(status_code=200, text="Ok.")
+            results = dict(iter_cluster_metrics(nodes, "test-cluster", 8123, logger, max_workers=3))
+
+        assert sorted(results) == list(range(5))
+        assert all(results[i][0].node_name == nodes[i].name for i in results)
+
+    def test_collect_cluster_metrics_empty_nodes(self):
+        """Test that an empty node list yields no metrics."""
+        logger = setup_logging(verbose=False)
+        assert collect_cluster_metrics([], "test-cluster", 8123, logger) == []
+
+
 class TestCreateProvider:
     """Tests for create_provider function."""
 
@@ -257,6 +327,111 @@ class TestMetricStorage:
             assert len(results) == 5
 
 
+    def test_store_batch_writes_header_once(self):
+        """Test that a batch for one file writes a single header and all lines."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = MetricStorage(base_dir=temp_dir)
+
+            timestamp = "2026-02-04T12:30:00"
+            metrics = [
+                MetricValue(
+                    metric_id=f"test-id-{i}",
+                    metric_name=f"metric_{i}",
+                    value=i,
+                    timestamp=timestamp,
+                    node_name="test-node-01",
+                    cluster_name="test-cluster",
+                )
+                for i in range(3)
+            ]
+
+            storage.store_batch(metrics)
+            storage.store_batch(metrics[:1])
+
+            log_file = os.path.join(
+                temp_dir, "test-cluster", "test-node-01", "2026", "02", "04", "12.log"
+            )
+            with open(log_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+
+            assert lines[0] == MetricStorage.CSV_HEADER
+            assert lines[1:] == [
+                "metric_0,2026-02-04T12:30:00,0",
+                "metric_1,2026-02-04T12:30:00,1",
+                "metric_2,2026-02-04T12:30:00,2",
+                "metric_0,2026-02-04T12:30:00,0",
+            ]
+
+    def test_store_batch_skips_header_for_existing_file(self):
+        """Test that a fresh storage does not re-add the header to an existing log."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metric = MetricValue(
+                metric_id="test-id",
+                metric_name="metric",
+                value=1,
+                timestamp="2026-02-04T12:30:00",
+                node_name="test-node-01",
+                cluster_name="test-cluster",
+            )
+
+            MetricStorage(base_dir=temp_dir).store_batch([metric])
+            MetricStorage(base_dir=temp_dir).store_batch([metric])
+
+            log_file = os.path.join(
+                temp_dir, "test-cluster", "test-node-01", "2026", "02", "04", "12.log"
+            )
+            with open(log_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+
+            assert lines.count(MetricStorage.CSV_HEADER) == 1
+            assert len(lines) == 3
+
+
+    def test_durable_store_batch_fsyncs_once_per_file(self):
+        """Test that a durable batch pays one fsync per log file, not per metric."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = MetricStorage(base_dir=temp_dir, durable=True)
+            metrics = [
+                MetricValue(
+                    metric_id=f"test-id-{i}",
+                    metric_name="metric",
+                    value=i,
+                    timestamp="2026-02-04T12:30:00",
+                    node_name=f"test-node-{i % 2}",
+                    cluster_name="test-cluster",
+                )
+                for i in range(6)
+            ]
+
+            with patch('os.fsync') as mock_fsync:
+                storage.store_batch(metrics)
+                assert mock_fsync.call_count == 2
+
+                MetricStorage(base_dir=temp_dir).store_batch(metrics)
+                assert mock_fsync.call_count == 2
+
+                storage.store(metrics[0])
+                assert mock_fsync.call_count == 3
+
+    def test_store_falls_back_for_non_extended_iso_timestamps(self):
+        """Test that basic-format ISO timestamps still map to the right hour file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = MetricStorage(base_dir=temp_dir)
+            metric = MetricValue(
+                metric_id="test-id",
+                metric_name="metric",
+                value=1,
+                timestamp="20260204T123000",
+                node_name="test-node-01",
+                cluster_name="test-cluster",
+            )
+            storage.store(metric)
+
+            assert os.path.exists(os.path.join(
+                temp_dir, "test-cluster", "test-node-01", "2026", "02", "04", "12.log"
+            ))
+
+
 class TestCollectorCLIIntegration:
     """Integration tests for collector CLI."""
 
@@ -273,7 +448,7 @@ class TestCollectorCLIIntegration:
             assert cluster is not None
             
             # Mock ClickHouse request
-            with patch('requests.get') as mock_get:
+            with patch('requests.Session.get') as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.text = "Ok."
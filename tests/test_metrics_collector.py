@@ -32,3 +32,396 @@ def test_metric_storage_store_and_query():
         assert len(queried) >= len(metrics)
     finally:
         shutil.rmtree(temp_dir)
+
+def test_metric_ids_are_unique_across_collectors():
+    first = create_default_registry()
+    second = create_default_registry()
+    ids = set()
+    for registry in (first, second):
+        for _ in range(3):
+            for metric in registry.collect_all(node_name="test-node", cluster_name="test-cluster"):
+                ids.add(metric.metric_id)
+    assert len(ids) == 6
+
+def test_system_collectors_read_from_snapshot():
+    from types import SimpleNamespace
+    from src.metrics.collector import (
+        SystemSnapshot, MemoryPercentCollector, NetworkBytesSentCollector, ProcessCountCollector
+    )
+    snapshot = SystemSnapshot(
+        cpu_percent=12.5,
+        memory=SimpleNamespace(percent=42.0, used=1024),
+        network=SimpleNamespace(bytes_recv=10, bytes_sent=20),
+        process_count=7,
+    )
+    with pytest.warns(DeprecationWarning):
+        collectors = [MemoryPercentCollector(), NetworkBytesSentCollector(), ProcessCountCollector()]
+    values = [c.collect("test-node", "test-cluster", snapshot=snapshot).value for c in collectors]
+    assert values == [42.0, 20, 7]
+
+def test_metric_value_to_dict_copies_tags():
+    from src.metrics.collector import MetricValue
+    metric = MetricValue(
+        metric_id="id-1", metric_name="cpu_percent", value=1.5,
+        timestamp="2026-02-04T12:00:00", node_name="n1", cluster_name="c1",
+        unit="%", tags={"host": "10.0.0.1"}
+    )
+    data = metric.to_dict()
+    assert data == {
+        'metric_id': "id-1", 'metric_name': "cpu_percent", 'value': 1.5,
+        'timestamp': "2026-02-04T12:00:00", 'node_name': "n1", 'cluster_name': "c1",
+        'unit': "%", 'tags': {"host": "10.0.0.1"},
+    }
+    data['tags']['host'] = "changed"
+    assert metric.tags == {"host": "10.0.0.1"}
+
+def test_system_metrics_table_reads_snapshot():
+    from types import SimpleNamespace
+    from src.metrics.collector import SystemSnapshot, SYSTEM_METRICS
+    snapshot = SystemSnapshot(
+        cpu_percent=12.5,
+        memory=SimpleNamespace(percent=42.0, used=1024),
+        process_count=7,
+    )
+    values = {name: extract(snapshot) for name, (_, extract, _) in SYSTEM_METRICS.items()}
+    assert values['cpu_percent'] == 12.5
+    assert values['memory_used'] == 1024
+    assert values['network_bytes_recv'] == 0
+    assert values['node_status'] == 1
+    assert values['process_count'] == 7
+
+def test_json_metric_storage_store_batch_writes_json_array(tmp_path):
+    import json
+    from src.metrics.collector import JsonMetricStorage, MetricValue
+    metrics = [
+        MetricValue(
+            metric_id=f"id-{i}", metric_name="clickhouse_status", value=i % 2,
+            timestamp="2026-02-04T12:00:00.123456", node_name=f"nöde-{i}", cluster_name="c1"
+        )
+        for i in range(3)
+    ]
+    json_file = JsonMetricStorage(base_dir=str(tmp_path)).store_batch(metrics)
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    assert data == [
+        {"clustername": "c1", "machinename": f"nöde-{i}", "metricname": "ch_ping",
+         "metricvalue": i % 2, "logtime": "2026-02-04T12:00:00"}
+        for i in range(3)
+    ]
+
+def test_json_metric_storage_store_batch_splits_clusters(tmp_path):
+    import json
+    from src.metrics.collector import JsonMetricStorage, MetricValue
+    metrics = [
+        MetricValue(
+            metric_id=f"id-{i}", metric_name="clickhouse_status", value=1,
+            timestamp="2026-02-04T12:00:00", node_name=f"n{i}", cluster_name=f"c{i % 2}"
+        )
+        for i in range(4)
+    ]
+    json_file = JsonMetricStorage(base_dir=str(tmp_path)).store_batch(metrics)
+    assert os.path.relpath(json_file, tmp_path).startswith("c0")
+    for cluster, nodes in (("c0", ["n0", "n2"]), ("c1", ["n1", "n3"])):
+        cluster_file = json_file.replace(os.sep + "c0" + os.sep, os.sep + cluster + os.sep)
+        with open(cluster_file, 'r', encoding='utf-8') as f:
+            assert [row["machinename"] for row in json.load(f)] == nodes
+
+def test_registry_collect_all_runs_collectors_concurrently():
+    import time
+    from src.metrics.collector import MetricCollector, MetricRegistry
+
+    class SlowCollector(MetricCollector):
+        def collect(self, node_name, cluster_name, **kwargs):
+            time.sleep(0.2)
+            return self._create_metric(node_name, cluster_name, 1)
+
+    class FailingCollector(MetricCollector):
+        def collect(self, node_name, cluster_name, **kwargs):
+            raise RuntimeError("boom")
+
+    registry = MetricRegistry()
+    for name in ("a", "b", "c"):
+        registry.register(SlowCollector(name=name))
+    registry.register(FailingCollector(name="broken"))
+
+    start = time.monotonic()
+    metrics = registry.collect_all(node_name="test-node", cluster_name="test-cluster")
+    assert time.monotonic() - start < 0.5
+    assert [m.metric_name for m in metrics] == ["a", "b", "c"]
+
+def test_json_dumps_is_compact_unless_pretty():
+    from src.metrics.collector import json_dumps
+    data = [{"machinename": "nöde", "metricvalue": 1}]
+    assert json_dumps(data) == '[{"machinename":"nöde","metricvalue":1}]'.encode('utf-8')
+    assert json_dumps(data, pretty=True).startswith(b'[\n  {\n    "machinename"')
+
+def test_json_dumps_serializes_metric_values_like_to_dict():
+    import json
+    from src.metrics.collector import MetricValue, json_dumps
+    metric = MetricValue(
+        metric_id="id-1", metric_name="clickhouse_status", value=1,
+        timestamp="2026-02-04T12:00:00", node_name="n1", cluster_name="c1",
+        tags={"host": "10.0.0.1"}
+    )
+    assert json.loads(json_dumps([metric])) == [metric.to_dict()]
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "cbor"])
+def test_json_metric_storage_formats_round_trip(tmp_path, fmt):
+    from src.metrics.collector import JsonMetricStorage, MetricValue, get_serializer
+    if fmt == "cbor":
+        pytest.importorskip("cbor2")
+    metrics = [
+        MetricValue(
+            metric_id=f"id-{i}", metric_name="clickhouse_status", value=i % 2,
+            timestamp="2026-02-04T12:00:00", node_name=f"n{i}", cluster_name="c1"
+        )
+        for i in range(3)
+    ]
+    storage = JsonMetricStorage(base_dir=str(tmp_path), fmt=fmt)
+    path = storage.store_batch(metrics)
+    assert path.endswith("." + fmt)
+    with open(path, 'rb') as f:
+        records = get_serializer(fmt).loads(f.read())
+    assert [r["machinename"] for r in records] == ["n0", "n1", "n2"]
+
+def test_cpu_and_process_collectors_avoid_repeated_blocking_calls(monkeypatch):
+    from types import SimpleNamespace
+    from src.metrics import collector as collector_module
+    from src.metrics.collector import CPUPercentCollector, ProcessCountCollector
+
+    intervals = []
+    pids_calls = []
+    fake_psutil = SimpleNamespace(
+        cpu_percent=lambda interval=None: intervals.append(interval) or 5.0,
+        pids=lambda: pids_calls.append(1) or [1, 2, 3],
+    )
+    monkeypatch.setattr(collector_module, "_get_psutil", lambda: fake_psutil)
+    monkeypatch.setattr(collector_module, "_cpu_primed", False)
+
+    with pytest.warns(DeprecationWarning):
+        cpu = CPUPercentCollector()
+        processes = ProcessCountCollector(interval=60)
+    for _ in range(3):
+        assert cpu.collect("test-node", "test-cluster").value == 5.0
+        assert processes.collect("test-node", "test-cluster").value == 3
+    assert intervals == [None] * 4
+    assert len(pids_calls) == 1
+
+def test_registry_collectors_share_system_readings(monkeypatch):
+    from types import SimpleNamespace
+    from src.metrics import collector as collector_module
+    from src.metrics.collector import (
+        MetricRegistry, MemoryPercentCollector, MemoryUsedCollector,
+        NetworkBytesRecvCollector, NetworkBytesSentCollector
+    )
+
+    calls = []
+    fake_psutil = SimpleNamespace(
+        virtual_memory=lambda: calls.append("memory") or SimpleNamespace(percent=42.0, used=1024),
+        net_io_counters=lambda: calls.append("network") or SimpleNamespace(bytes_recv=10, bytes_sent=20),
+    )
+    monkeypatch.setattr(collector_module, "_get_psutil", lambda: fake_psutil)
+
+    registry = MetricRegistry()
+    with pytest.warns(DeprecationWarning):
+        for cls in (MemoryPercentCollector, MemoryUsedCollector,
+                    NetworkBytesRecvCollector, NetworkBytesSentCollector):
+            registry.register(cls())
+    metrics = registry.collect_all(node_name="test-node", cluster_name="test-cluster")
+    assert [m.value for m in metrics] == [42.0, 1024, 10, 20]
+    assert sorted(calls) == ["memory", "network"]
+
+def test_metric_storage_query_crosses_month_boundary(tmp_path):
+    from datetime import datetime
+    from src.metrics.collector import MetricValue
+    storage = MetricStorage(base_dir=str(tmp_path))
+    for i, ts in enumerate(["2026-01-31T22:30:00", "2026-01-31T23:59:59", "2026-02-01T00:15:00"]):
+        storage.store(MetricValue(
+            metric_id=f"id-{i}", metric_name="clickhouse_status", value=1,
+            timestamp=ts, node_name="n1", cluster_name="c1"
+        ))
+    queried = storage.query("c1", "n1", datetime(2026, 1, 31, 23, 0), datetime(2026, 2, 1, 1, 0))
+    assert [m['timestamp'] for m in queried] == ["2026-01-31T23:59:59", "2026-02-01T00:15:00"]
+    assert not os.path.exists(tmp_path / "c1" / "n1" / "2026" / "02" / "01" / "01.log")
+
+def test_metric_storage_concurrent_stores_write_one_header_per_file(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.metrics.collector import MetricValue
+    storage = MetricStorage(base_dir=str(tmp_path))
+    metrics = [
+        MetricValue(
+            metric_id=f"id-{i}", metric_name="clickhouse_status", value=1,
+            timestamp="2026-02-04T12:00:00", node_name=f"n{i % 4}", cluster_name="c1"
+        )
+        for i in range(200)
+    ]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(storage.store, metrics))
+    for node in range(4):
+        with open(tmp_path / "c1" / f"n{node}" / "2026" / "02" / "04" / "12.log", encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert lines[0] == MetricStorage.CSV_HEADER
+        assert len(lines) == 51
+        assert MetricStorage.CSV_HEADER not in lines[1:]
+
+def test_registry_collect_all_shares_one_timestamp():
+    from src.metrics.collector import MetricCollector, MetricRegistry
+
+    class StampedCollector(MetricCollector):
+        def collect(self, node_name, cluster_name, **kwargs):
+            return self._create_metric(node_name, cluster_name, 1, kwargs.get('timestamp'))
+
+    registry = MetricRegistry()
+    for name in ("a", "b", "c"):
+        registry.register(StampedCollector(name=name))
+    metrics = registry.collect_all(node_name="test-node", cluster_name="test-cluster")
+    assert len({m.timestamp for m in metrics}) == 1
+    metrics = registry.collect_all(node_name="test-node", cluster_name="test-cluster",
+                                   timestamp="2026-02-04T12:00:00")
+    assert {m.timestamp for m in metrics} == {"2026-02-04T12:00:00"}
+
+def test_metric_storage_query_skips_hours_ruled_out_by_index(tmp_path):
+    import json
+    from datetime import datetime
+    from src.metrics.collector import MetricValue
+    storage = MetricStorage(base_dir=str(tmp_path))
+    storage.store_batch([
+        MetricValue(metric_id=f"id-{i}", metric_name="clickhouse_status", value=1,
+                    timestamp=f"2026-02-04T12:{10 + i}:00", node_name="n1", cluster_name="c1")
+        for i in range(3)
+    ])
+    log_file = tmp_path / "c1" / "n1" / "2026" / "02" / "04" / "12.log"
+    with open(str(log_file) + ".idx", encoding='utf-8') as f:
+        assert json.load(f) == {"min_ts": "2026-02-04T12:10:00", "max_ts": "2026-02-04T12:12:00",
+                                "metric_names": ["clickhouse_status"]}
+
+    # A row the index does not know about is only seen once the sidecar is gone
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write("other_metric,2026-02-04T12:30:00,5\n")
+    start, end = datetime(2026, 2, 4, 12, 0), datetime(2026, 2, 4, 13, 0)
+    assert storage.query("c1", "n1", start, end, "other_metric") == []
+    assert storage.query("c1", "n1", datetime(2026, 2, 4, 12, 20), end) == []
+    assert len(storage.query("c1", "n1", start, end, "clickhouse_status")) == 3
+
+    os.remove(str(log_file) + ".idx")
+    assert [m['value'] for m in storage.query("c1", "n1", start, end, "other_metric")] == [5]
+
+def test_metric_storage_listings_follow_directory_changes(tmp_path):
+    from unittest.mock import patch
+    storage = MetricStorage(base_dir=str(tmp_path))
+    (tmp_path / "c1" / "n1").mkdir(parents=True)
+    (tmp_path / "notes.txt").write_text("not a cluster", encoding='utf-8')
+    assert storage.list_clusters() == ["c1"]
+    assert storage.list_nodes("c1") == ["n1"]
+    assert storage.list_nodes("missing") == []
+
+    with patch('os.scandir', side_effect=AssertionError("rescanned")):
+        assert storage.list_clusters() == ["c1"]
+        assert storage.list_nodes("c1") == ["n1"]
+
+    (tmp_path / "c2").mkdir()
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))
+    assert sorted(storage.list_clusters()) == ["c1", "c2"]
+
+def test_system_metric_live_readers_run(monkeypatch):
+    from src.metrics import collector as collector_module
+    from src.metrics.collector import SYSTEM_METRICS
+    pytest.importorskip("psutil")
+    monkeypatch.setattr(collector_module, "_cpu_primed", True)
+    for name in ("process_count", "memory_used", "load_average", "disk_used"):
+        _, _, read_live = SYSTEM_METRICS[name]
+        assert read_live(collector_module._default_disk_path()) >= 0
+
+    monkeypatch.setattr(collector_module, "_get_psutil", lambda: None)
+    _, _, read_load_average = SYSTEM_METRICS["load_average"]
+    assert read_load_average("/") == 0.0
+
+def test_metric_storage_index_survives_failures_and_other_instances(tmp_path):
+    import json
+    from datetime import datetime
+    from unittest.mock import patch
+    from src.metrics.collector import MetricValue
+
+    def metric(name, minute):
+        return MetricValue(metric_id=f"{name}-{minute}", metric_name=name, value=1,
+                           timestamp=f"2026-02-04T12:{minute:02d}:00", node_name="n1", cluster_name="c1")
+
+    log_file = str(tmp_path / "c1" / "n1" / "2026" / "02" / "04" / "12.log")
+    start, end = datetime(2026, 2, 4, 12, 0), datetime(2026, 2, 4, 13, 0)
+
+    # Two writers (as in separate processes) merge into one sidecar
+    first, second = MetricStorage(base_dir=str(tmp_path)), MetricStorage(base_dir=str(tmp_path))
+    first.store(metric("a", 10))
+    second.store(metric("b", 20))
+    first.store(metric("a", 15))
+    with open(log_file + ".idx", encoding='utf-8') as f:
+        assert json.load(f) == {"min_ts": "2026-02-04T12:10:00", "max_ts": "2026-02-04T12:20:00",
+                                "metric_names": ["a", "b"]}
+    assert len(first.query("c1", "n1", start, end, "b")) == 1
+
+    # The sidecar is widened before the rows are appended
+    with patch.object(MetricStorage, "_append", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            first.store(metric("c", 30))
+    with open(log_file + ".idx", encoding='utf-8') as f:
+        assert "c" in json.load(f)["metric_names"]
+
+    # A sidecar that cannot be written is dropped and the store still succeeds
+    with patch("os.replace", side_effect=PermissionError("denied")):
+        first.store(metric("d", 40))
+    assert not os.path.exists(log_file + ".idx")
+    assert [m['metric_name'] for m in first.query("c1", "n1", start, end, "d")] == ["d"]
+
+def test_metric_storage_concurrent_instances_keep_each_others_rows(tmp_path):
+    import threading
+    from datetime import datetime
+    from src.metrics.collector import MetricValue
+
+    start, end = datetime(2026, 2, 4, 12, 0), datetime(2026, 2, 4, 13, 0)
+    for run in range(5):
+        base_dir = str(tmp_path / str(run))
+        storages = [MetricStorage(base_dir=base_dir), MetricStorage(base_dir=base_dir)]
+        barrier = threading.Barrier(len(storages))
+
+        def write(writer):
+            barrier.wait()
+            for i in range(50):
+                storages[writer].store(MetricValue(
+                    metric_id=f"{writer}-{i}", metric_name=f"w{writer}-{i}", value=i,
+                    timestamp=f"2026-02-04T12:{i:02d}:00", node_name="n1", cluster_name="c1"))
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(len(storages))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        reader = MetricStorage(base_dir=base_dir)
+        assert len(reader.query("c1", "n1", start, end)) == 100
+        for writer in range(len(storages)):
+            for i in range(50):
+                assert len(reader.query("c1", "n1", start, end, f"w{writer}-{i}")) == 1
+        log_dir = tmp_path / str(run) / "c1" / "n1" / "2026" / "02" / "04"
+        assert sorted(os.listdir(log_dir)) == ["12.log", "12.log.idx"]
+        with open(log_dir / "12.log", encoding='utf-8') as f:
+            assert f.read().count(MetricStorage.CSV_HEADER) == 1
+
+def test_load_average_estimate_reuses_snapshot_cpu_reading(monkeypatch):
+    from types import SimpleNamespace
+    from src.metrics import collector as collector_module
+    from src.metrics.collector import LazySystemSnapshot
+
+    intervals = []
+    # No getloadavg, as on Windows
+    fake_psutil = SimpleNamespace(
+        cpu_percent=lambda interval=None: intervals.append(interval) or 50.0,
+        cpu_count=lambda: 4,
+    )
+    monkeypatch.setattr(collector_module, "_get_psutil", lambda: fake_psutil)
+    monkeypatch.setattr(collector_module, "_cpu_count", lambda: 4)
+    monkeypatch.setattr(collector_module, "_cpu_primed", True)
+
+    snapshot = LazySystemSnapshot()
+    assert snapshot.load_average == 2.0
+    assert snapshot.cpu_percent == 50.0
+    assert intervals == [None]
@@ -33,3 +33,66 @@ def test_collection_scheduler_runs_cycle():
                 assert isinstance(queried, list)
     finally:
         shutil.rmtree(temp_dir)
+
+def test_collection_cycle_covers_all_nodes_concurrently():
+    from unittest.mock import MagicMock
+    provider = FileClusterProvider('config/clusters.yaml')
+    registry = MagicMock()
+    registry.collect_all.return_value = []
+    storage = MagicMock()
+    scheduler = CollectionScheduler(
+        cluster_provider=provider,
+        metric_registry=registry,
+        metric_storage=storage,
+        alert_manager=AlertManager(),
+        interval_seconds=1,
+        max_workers=4
+    )
+    scheduler._collection_cycle()
+    expected = {(c.name, n.name) for c in provider.get_clusters() for n in c.nodes}
+    collected = {(kw['cluster_name'], kw['node_name']) for _, kw in registry.collect_all.call_args_list}
+    assert collected == expected
+    assert storage.store_batch.call_count == len(expected)
+
+def test_collection_cycle_evaluates_alerts_per_cluster_metric():
+    from unittest.mock import MagicMock
+    from src.metrics.collector import MetricValue
+    provider = FileClusterProvider('config/clusters.yaml')
+    registry = MagicMock()
+    registry.collect_all.side_effect = lambda node_name, cluster_name, timestamp: [
+        MetricValue("id", "cpu_percent", 50.0, timestamp, node_name, cluster_name),
+        MetricValue("id", "status_text", "ok", timestamp, node_name, cluster_name),
+    ]
+    alert_manager = MagicMock()
+    alert_manager.evaluate_metric_batch.return_value = []
+    scheduler = CollectionScheduler(
+        cluster_provider=provider,
+        metric_registry=registry,
+        metric_storage=MagicMock(),
+        alert_manager=alert_manager,
+        interval_seconds=1
+    )
+    scheduler._collection_cycle()
+    calls = alert_manager.evaluate_metric_batch.call_args_list
+    clusters = provider.get_clusters()
+    assert len(calls) == len(clusters)
+    for _, kw in calls:
+        assert kw['metric_name'] == "cpu_percent"
+        cluster = next(c for c in clusters if c.name == kw['cluster_name'])
+        assert sorted(kw['node_names']) == sorted(n.name for n in cluster.nodes)
+        assert kw['values'] == [50.0] * len(cluster.nodes)
+
+def test_stop_flushes_coalesced_alerts():
+    from unittest.mock import MagicMock
+    alert_manager = MagicMock()
+    scheduler = CollectionScheduler(
+        cluster_provider=MagicMock(),
+        metric_registry=MagicMock(),
+        metric_storage=MagicMock(),
+        alert_manager=alert_manager,
+        interval_seconds=1
+    )
+    scheduler._running = True
+    scheduler._scheduler = MagicMock()
+    scheduler.stop()
+    alert_manager.flush_pending.assert_called_once()